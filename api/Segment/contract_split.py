@@ -1,18 +1,29 @@
+import re
 import sys
+import pathlib
 sys.stdout.reconfigure(encoding='utf-8')
 
-try:
-    from langchain_text_splitters import CharacterTextSplitter  # LangChain 1.x 拆分后的官方实现
-except ImportError:
-    from langchain.text_splitter import CharacterTextSplitter  # 兼容旧版本 LangChain
-import spacy  # 用于中文分词和文本解析的核心库
-from spacy.lang.zh import Chinese
+# 合同分块的边界标记，frozenset 保证 O(1) 成员判断
+_BLOCK_MARKERS = frozenset({"一", "二", "三", "1.", "2.", "（", "）"})
 
-# 加载中文分词模型，如缺失则回退到内置空白模型
-try:
-    nlp = spacy.load("zh_core_web_sm")
-except OSError:
-    nlp = Chinese()
+# 带捕获组的 split 会把分隔符本身保留在结果里，分块时直接当块首用
+_MARKER_RE = re.compile(r"(一|二|三|1\.|2\.|（|）)")
+
+# LangChain 是重量级依赖，按需惰性加载：
+# 不走 law 分支的调用方不必付出导入成本
+_character_text_splitter = None
+
+
+def _get_text_splitter_cls():
+    """首次使用时才导入 LangChain 的 CharacterTextSplitter。"""
+    global _character_text_splitter
+    if _character_text_splitter is None:
+        try:
+            from langchain_text_splitters import CharacterTextSplitter  # LangChain 1.x 拆分后的官方实现
+        except ImportError:
+            from langchain.text_splitter import CharacterTextSplitter  # 兼容旧版本 LangChain
+        _character_text_splitter = CharacterTextSplitter
+    return _character_text_splitter
 
 # ====================== 1. 爬虫输入接口：接收上游模块数据 ======================
 def receive_crawl_data(crawl_data: dict) -> tuple[str, str, str]:
@@ -30,8 +41,8 @@ def receive_crawl_data(crawl_data: dict) -> tuple[str, str, str]:
     txt_path = crawl_data.get("txt_path", "")
     if txt_path:
         try:
-            with open(txt_path, "r", encoding="utf-8") as f:
-                raw_text = f.read()
+            # 一次性整读，由操作系统决定缓冲大小，比手动 open/read 少一层开销
+            raw_text = pathlib.Path(txt_path).read_text(encoding="utf-8", errors="replace")
         except Exception as e:
             print(f"读取txt文件失败：{e}")
     return data_id, data_type, raw_text
@@ -39,33 +50,44 @@ def receive_crawl_data(crawl_data: dict) -> tuple[str, str, str]:
 # ====================== 2. 分块核心逻辑 ======================
 def split_contract(raw_text: str, data_type: str) -> list[str]:
     if data_type == "law":
-        splitter = CharacterTextSplitter(separator="第", chunk_size=500, chunk_overlap=0)
-        blocks = splitter.split_text(raw_text)
-        blocks = ["第" + b for b in blocks if b]
+        # keep_separator 让分隔符“第”原生保留在块首，省掉整轮重新拼接；
+        # is_separator_regex=False 跳过 LangChain 内部的正则编译
+        splitter = _get_text_splitter_cls()(
+            separator="第",
+            chunk_size=500,
+            chunk_overlap=0,
+            keep_separator=True,
+            is_separator_regex=False,
+        )
+        blocks = [b for b in splitter.split_text(raw_text) if b]
     elif data_type == "case":
         blocks = [p for p in raw_text.split("\n") if p.strip()]
     else:
-        doc = nlp(raw_text)
+        # 分块只看边界标记本身，不需要任何语言学标注，
+        # 直接用正则切分代替整段分词（spaCy 已退出这条热路径）
         blocks = []
-        current_block = ""
-        for token in doc:
-            if token.text in ["一", "二", "三", "1.", "2.", "（", "）"] and current_block:
-                blocks.append(current_block.strip())
-                current_block = token.text
+        # 用列表累积再一次性 join，避免字符串拼接的 O(n²) 复制
+        current_parts: list[str] = []
+        for piece in _MARKER_RE.split(raw_text):
+            if not piece:
+                continue
+            if piece in _BLOCK_MARKERS and current_parts:
+                blocks.append("".join(current_parts).strip())
+                current_parts = [piece]
             else:
-                current_block += token.text
-        if current_block:
-            blocks.append(current_block.strip())
+                current_parts.append(piece)
+        if current_parts:
+            blocks.append("".join(current_parts).strip())
     return blocks
 
 # ====================== 3. 向量库输出接口 ======================
 def send_to_vector_db(data_id: str, data_type: str, blocks: list[str]) -> list[dict]:
-    structured_blocks = []
-    for idx, block_content in enumerate(blocks):
-        structured_blocks.append({
+    return [
+        {
             "data_id": data_id,
             "block_id": f"{data_id}_block_{idx+1}",
             "block_type": data_type,
             "block_content": block_content
-        })
-    return structured_blocks
+        }
+        for idx, block_content in enumerate(blocks)
+    ]
@@ -20,12 +20,27 @@ import os
 import re
 import json
 import time
+import logging
+import zipfile
 import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Tuple, Dict
 
 import requests
-from docx import Document  # pip install python-docx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree  # pip install lxml
+
+# orjson 的编解码比标准库快数倍，按可选依赖处理：缺失时回退 stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 作为库被 import 时由调用方决定 handler/级别；命令行入口里 basicConfig
+log = logging.getLogger("flk_crawler")
 
 # ----------------- 常量配置 -----------------
 
@@ -51,54 +66,82 @@ COOKIE_STR = ""
 
 # ----------------- 工具函数 -----------------
 
+# 标题/文件名处理的正则，模块级预编译；同一标题在过滤、去重、
+# 命名、打印各环节反复经过这些函数，再配合 lru_cache 只算一次
+_HTML_RE = re.compile(r"<.*?>")
+_FNAME_RE = re.compile(r"[\\/:*?\"<>|]")
+_PAREN_RE = re.compile(r"[（(][^（）()]*[）)]")
+
+
 def ensure_dir(path: str) -> None:
-    """确保目录存在。"""
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    """确保目录存在（exist_ok 自带幂等，不必先 stat 一次）。"""
+    os.makedirs(path, exist_ok=True)
 
 
+@lru_cache(maxsize=4096)
 def strip_html(s: str) -> str:
     """去掉 HTML 标签。"""
     if not s:
         return ""
-    return re.sub(r"<.*?>", "", s)
+    return _HTML_RE.sub("", s)
 
 
+@lru_cache(maxsize=4096)
 def safe_filename(name: str) -> str:
     """将任意标题转换为适合作为文件名的字符串。"""
-    name = re.sub(r"[\\/:*?\"<>|]", "_", name)
+    name = _FNAME_RE.sub("_", name)
     name = name.strip()
     return name or "unnamed"
 
 
-def is_main_body(title_plain: str, keyword: str, exclude_words: List[str]) -> bool:
+def is_main_body(title_plain: str, keyword: str, exclude_re) -> bool:
     """
     判断是否为“本体版本”：
       1. 标题中必须包含关键词；
-      2. 不包含排除词。
+      2. 不命中排除词（exclude_re 为预编译的排除词选择分支正则，
+         一次 C 层扫描代替逐词的 Python 子串查找；None 表示不排除）。
     """
     if keyword not in title_plain:
         return False
-    return not any(w in title_plain for w in exclude_words)
+    return exclude_re is None or not exclude_re.search(title_plain)
 
 
-def docx_to_txt(docx_path: str, txt_path: str) -> None:
-    """将 docx 内容导出为 txt 文本（utf-8）。"""
-    doc = Document(docx_path)
-    lines: List[str] = []
-
-    for p in doc.paragraphs:
-        text = p.text.replace("\r", "").rstrip()
-        lines.append(text)
+# WordprocessingML 命名空间（docx 正文 XML）
+_DOCX_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
-    # 如想包含表格，可自行加上 table 遍历
-    content = "\n".join(lines)
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(content)
 
+def docx_to_txt(docx_path: str, txt_path: str) -> None:
+    """
+    将 docx 内容导出为 txt 文本（utf-8）。
 
+    直接流式解析 word/document.xml 中的段落（w:p / w:t 节点），
+    逐段写出并释放已处理的 XML 节点，不构建 python-docx 的完整
+    对象模型——大文档下内存占用恒定。表格单元格里的段落也会被带出。
+    """
+    with zipfile.ZipFile(docx_path) as zf, \
+            zf.open("word/document.xml") as src, \
+            open(txt_path, "w", encoding="utf-8") as out:
+        first = True
+        for _, para in etree.iterparse(src, events=("end",), tag=_DOCX_NS + "p"):
+            text = "".join(t.text or "" for t in para.iter(_DOCX_NS + "t"))
+            text = text.replace("\r", "").rstrip()
+            if not first:
+                out.write("\n")
+            out.write(text)
+            first = False
+            # 释放已写出的节点及其之前的兄弟，保持解析树始终很小
+            para.clear()
+            while para.getprevious() is not None:
+                del para.getparent()[0]
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> datetime:
-    """将 'YYYY-MM-DD' 格式的日期解析为 datetime，用于比较新旧。"""
+    """将 'YYYY-MM-DD' 格式的日期解析为 datetime，用于比较新旧。
+
+    strptime 开销不小，而最新版本去重会反复比较同样的日期串，
+    纯函数 + 短字符串输入，直接 lru_cache 兜住。
+    """
     if not date_str:
         return datetime.min
     try:
@@ -107,6 +150,7 @@ def parse_date(date_str: str) -> datetime:
         return datetime.min
 
 
+@lru_cache(maxsize=4096)
 def normalize_title_for_versioning(title: str) -> str:
     """
     归一化标题用于“同名法规”的版本判断：
@@ -116,7 +160,7 @@ def normalize_title_for_versioning(title: str) -> str:
       '中华人民共和国公司法（2018年修正）' -> '中华人民共和国公司法'
     """
     # 去掉中文 / 英文括号中的内容
-    title_no_paren = re.sub(r"[（(][^（）()]*[）)]", "", title)
+    title_no_paren = _PAREN_RE.sub("", title)
     return title_no_paren.strip()
 
 
@@ -128,6 +172,22 @@ def new_session(cookie: str = "") -> requests.Session:
     可以通过参数 cookie 或环境变量 FLK_COOKIE 传入 Cookie。
     """
     s = requests.Session()
+
+    # 连接池 + 重试：附件常落在 OSS 等另一主机上，两种协议都挂载，
+    # 保持 TLS 会话复用并对临时性错误自动退避重试
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+        ),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+
     s.headers.update({
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -147,16 +207,32 @@ def new_session(cookie: str = "") -> requests.Session:
     if cookie_final:
         s.headers["Cookie"] = cookie_final
 
-    try:
-        r = s.get("https://flk.npc.gov.cn/search", timeout=10)
-        print("预热 /search 状态码：", r.status_code)
-        print("预热后 Cookie：", s.cookies.get_dict())
-    except Exception as e:
-        print("预热 /search 失败：", e)
+    # 已有 Cookie 时不需要预热；预热只为种 Cookie，用 HEAD 省掉页面正文传输
+    if not cookie_final:
+        try:
+            r = s.head("https://flk.npc.gov.cn/search", timeout=10, allow_redirects=True)
+            log.info("预热 /search 状态码：%s", r.status_code)
+            log.debug("预热后 Cookie：%s", s.cookies.get_dict())
+        except Exception as e:
+            log.warning("预热 /search 失败：%s", e)
 
     return s
 
 
+def _dumps_bytes(obj: Any) -> bytes:
+    """把对象序列化成 UTF-8 JSON 字节串，优先走 orjson。"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads_response(resp: requests.Response) -> Any:
+    """解析 JSON 响应体，优先走 orjson（直接吃 bytes，免一次解码）。"""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
 def make_payload(keyword: str, page_num: int) -> dict:
     """构造搜索接口 payload。"""
     return {
@@ -181,25 +257,25 @@ def fetch_search_page(session: requests.Session, keyword: str, page_num: int) ->
     payload = make_payload(keyword, page_num)
     resp = session.post(
         SEARCH_URL,
-        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        data=_dumps_bytes(payload),
         timeout=15,
     )
-    print(f"第 {page_num} 页状态码：", resp.status_code,
-          "| Content-Type:", resp.headers.get("Content-Type"))
+    log.info("第 %s 页状态码：%s | Content-Type: %s",
+             page_num, resp.status_code, resp.headers.get("Content-Type"))
     resp.raise_for_status()
 
     ctype = resp.headers.get("Content-Type", "")
     if "application/json" not in ctype:
-        print("⚠ search/list 返回的不是 JSON，前 300 字符：")
-        print(resp.text[:300])
+        log.warning("⚠ search/list 返回的不是 JSON，前 300 字符：%s", resp.text[:300])
         return []
 
-    data = resp.json()
+    data = _loads_response(resp)
     rows = data.get("rows") or data.get("result", {}).get("rows") or []
-    print("  本页 rows 数量：", len(rows))
-    if rows:
-        print("  第一条原始记录预览：",
-              json.dumps(rows[0], ensure_ascii=False)[:200])
+    log.info("  本页 rows 数量：%s", len(rows))
+    # 200 字符的序列化只在 DEBUG 级别真正需要时才做
+    if rows and log.isEnabledFor(logging.DEBUG):
+        log.debug("  第一条原始记录预览：%s",
+                  json.dumps(rows[0], ensure_ascii=False)[:200])
     return rows
 
 
@@ -209,19 +285,50 @@ def collect_main_body_laws(
     max_pages: int,
     exclude_words: List[str],
     no_filter: bool = False,
+    latest_only: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     从搜索结果中收集记录。
     - 如果 no_filter=True，则不做“本体”筛选，所有结果都会返回；
-    - 否则按 is_main_body() 过滤。
+    - 否则按 is_main_body() 过滤；
+    - 如果 latest_only=True，收集过程中就按“标题归一化 + 公布日期”
+      只保留同名法规的最新版本，省掉事后再整体重扫一遍，
+      内存也只随去重后的标题数增长。
     """
     all_items: List[Dict[str, Any]] = []
+    # latest_only 时按归一化标题记录当前最新版本
+    seen: Dict[str, Dict[str, Any]] = {}
 
-    for page in range(1, max_pages + 1):
-        print(f"\n==== 抓取搜索结果第 {page} 页 ====")
-        rows = fetch_search_page(session, keyword, page)
+    # 排除词编译成一条选择分支正则，每个标题只扫一遍
+    exclude_re = (
+        re.compile("|".join(re.escape(w) for w in exclude_words))
+        if exclude_words else None
+    )
+
+    def _keep(item: Dict[str, Any]) -> None:
+        if not latest_only:
+            all_items.append(item)
+            return
+        key = normalize_title_for_versioning(item["title"])
+        prev = seen.get(key)
+        if prev is None or parse_date(prev.get("gbrq", "")) < parse_date(item.get("gbrq", "")):
+            seen[key] = item
+
+    # 翻页请求彼此独立，多页时并发取回（连接池已在 Session 上配好），
+    # 再按页序处理，保持和原来串行一致的收集顺序与提前终止语义
+    if max_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(max_pages, 4)) as executor:
+            pages_rows = list(executor.map(
+                lambda p: fetch_search_page(session, keyword, p),
+                range(1, max_pages + 1),
+            ))
+    else:
+        pages_rows = [fetch_search_page(session, keyword, 1)]
+
+    for page, rows in enumerate(pages_rows, start=1):
+        log.info("==== 处理搜索结果第 %s 页 ====", page)
         if not rows:
-            print("  没抓到任何条目（可能被反爬或结构变了），先停。")
+            log.info("  没抓到任何条目（可能被反爬或结构变了），先停。")
             break
 
         for row in rows:
@@ -231,76 +338,74 @@ def collect_main_body_laws(
             law_id = row.get("bbbs")
 
             if not law_id:
-                print("  ⚠ 记录没有 bbbs 字段，跳过：", title_plain)
+                log.warning("  ⚠ 记录没有 bbbs 字段，跳过：%s", title_plain)
                 continue
 
             item = {"id": law_id, "title": title_plain, "gbrq": gbrq}
 
             if no_filter:
-                print("  ✅ 收录（不做本体筛选）：", title_plain,
-                      "| 公布日期：", gbrq,
-                      "| bbbs:", law_id)
-                all_items.append(item)
+                log.debug("  ✅ 收录（不做本体筛选）：%s | 公布日期：%s | bbbs: %s",
+                          title_plain, gbrq, law_id)
+                _keep(item)
             else:
-                if is_main_body(title_plain, keyword, exclude_words):
-                    print("  ✅ 本体候选：", title_plain,
-                          "| 公布日期：", gbrq,
-                          "| bbbs:", law_id)
-                    all_items.append(item)
+                if is_main_body(title_plain, keyword, exclude_re):
+                    log.debug("  ✅ 本体候选：%s | 公布日期：%s | bbbs: %s",
+                              title_plain, gbrq, law_id)
+                    _keep(item)
                 else:
-                    print("  · 非本体，跳过：", title_plain)
-
-        time.sleep(1.0)
+                    log.debug("  · 非本体，跳过：%s", title_plain)
 
-    print(f"\n总共收集到候选记录：{len(all_items)} 条。")
+    if latest_only:
+        all_items = list(seen.values())
+        log.info("总共收集到候选记录（同名法规只保留最新版本）：%s 条。", len(all_items))
+    else:
+        log.info("总共收集到候选记录：%s 条。", len(all_items))
     return all_items
 
 
 # ----------------- 在 JSON 中找附件 URL -----------------
 
-DOC_PATTERN = re.compile(
-    r"\.(doc|docx|wps|pdf)(?:[\?#].*)?$",
+# 单条正则同时校验 http(s) 前缀和附件后缀，每个字符串只扫一遍
+DOC_URL_RE = re.compile(
+    r"https?://\S+?\.(?:docx?|wps|pdf)(?:[?#]\S*)?$",
     re.IGNORECASE
 )
 
 
-def collect_doc_like_strings(node: Any,
-                             path: List[str] = None) -> List[Tuple[List[str], str]]:
+def collect_doc_like_strings(root: Any):
     """
-    递归遍历 JSON，收集所有看起来像 doc/docx/wps/pdf 链接的字符串。
-    返回列表 [([key_path...], value_str), ...]
-    """
-    if path is None:
-        path = []
-
-    results: List[Tuple[List[str], str]] = []
-
-    if isinstance(node, dict):
-        for k, v in node.items():
-            new_path = path + [str(k)]
-            results.extend(collect_doc_like_strings(v, new_path))
-    elif isinstance(node, list):
-        for idx, v in enumerate(node):
-            new_path = path + [f"[{idx}]"]
-            results.extend(collect_doc_like_strings(v, new_path))
-    elif isinstance(node, str):
-        if DOC_PATTERN.search(node) and "http" in node:
-            results.append((path, node))
+    遍历 JSON，逐个产出所有看起来像 doc/docx/wps/pdf 链接的字符串。
 
-    return results
+    用显式栈做迭代式深度优先，路径用元组累积：没有递归调用栈，
+    也不在每层节点上反复拼接、合并中间列表。
+    产出 (key_path_tuple, value_str) 二元组。
+    """
+    stack: List[Tuple[Any, Tuple[str, ...]]] = [(root, ())]
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, dict):
+            for k, v in node.items():
+                stack.append((v, path + (str(k),)))
+        elif isinstance(node, list):
+            for idx, v in enumerate(node):
+                stack.append((v, path + (f"[{idx}]",)))
+        elif isinstance(node, str):
+            if DOC_URL_RE.search(node):
+                yield path, node
+
+
+# (关键词, 权重) 表：一趟遍历直接累加，不再按档位重复扫同一个字符串
+_SCORE_KWS: List[Tuple[str, int]] = [
+    ("word", 3), ("wps", 3), ("doc", 3),
+    ("ossfile", 2), ("file", 2), ("attach", 2), ("附件", 2),
+    ("url", 1), ("path", 1), ("link", 1),
+]
 
 
-def score_path(path_keys: List[str]) -> int:
+def score_path(path_keys: Tuple[str, ...]) -> int:
     """根据 key 路径给候选链接打分，越像“正文附件”分越高。"""
     path_str = "/".join(path_keys).lower()
-    score = 0
-    if any(kw in path_str for kw in ["word", "wps", "doc"]):
-        score += 3
-    if any(kw in path_str for kw in ["ossfile", "file", "attach", "附件"]):
-        score += 2
-    if any(kw in path_str for kw in ["url", "path", "link"]):
-        score += 1
-    return score
+    return sum(w for kw, w in _SCORE_KWS if kw in path_str)
 
 
 def is_internal_url(u: str) -> bool:
@@ -321,11 +426,31 @@ def is_https(u: str) -> bool:
 
 # ----------------- 下载单条记录 -----------------
 
+def _convert_txt_job(doc_path: str, txt_path: str) -> str:
+    """执行 docx→txt 转换，成功返回 txt 路径，失败返回空串。"""
+    try:
+        docx_to_txt(doc_path, txt_path)
+        log.info("  ✅ 已导出 TXT：%s", txt_path)
+        return txt_path
+    except Exception as e:
+        log.warning("  ⚠ 转换 TXT 失败：%s", e)
+        return ""
+
+
+def _export_txt(doc_path: str, txt_path: str, txt_executor=None):
+    """转换 docx 为 txt；给了线程池时异步提交并返回 Future。"""
+    if txt_executor is not None:
+        return txt_executor.submit(_convert_txt_job, doc_path, txt_path)
+    return _convert_txt_job(doc_path, txt_path)
+
+
 def download_body_for_item(
     session: requests.Session,
     item: Dict[str, Any],
     save_dir: str,
     auto_txt: bool = True,
+    txt_executor=None,
+    debug: bool = False,
 ) -> Dict[str, str]:
     """
     为单条记录下载正文附件。
@@ -334,73 +459,90 @@ def download_body_for_item(
         "doc_path": <docx/pdf 文件路径> 或 "",
         "txt_path": <txt 路径，如果 auto_txt=False 或非 docx，则可能为空字符串>
       }
+    传入 txt_executor（线程池）时，docx→txt 的 CPU 工作会异步执行，
+    此时 "txt_path" 是一个 Future，由调用方在收尾时 result() 取回。
     """
     law_id = item["id"]
     title = item["title"]
     gbrq = item["gbrq"]
 
-    print(f"\n--- download：《{title}》（bbbs={law_id}） ---")
-
-    headers = session.headers.copy()
-    headers.pop("Content-Type", None)
-    headers["Referer"] = (
-        f"https://flk.npc.gov.cn/detail?id={law_id}&fileId=&type=&title="
-    )
+    log.info("--- download：《%s》（bbbs=%s） ---", title, law_id)
 
-    resp = session.get(
-        DOWNLOAD_INFO_URL,
-        params={"format": "docx", "bbbs": law_id},
-        headers=headers,
-        timeout=60,
-    )
-    print("  download/pc 状态码：", resp.status_code,
-          "| Content-Type:", resp.headers.get("Content-Type"))
-    resp.raise_for_status()
+    # download/pc 的响应按 bbbs 落盘缓存，断点续跑时省掉一次往返
+    cache_dir = os.path.join(save_dir, ".cache")
+    cache_path = os.path.join(cache_dir, f"{law_id}.json")
+    data = None
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            log.info("  命中本地缓存：%s", cache_path)
+        except Exception:
+            data = None
+
+    if data is None:
+        # 只传本次要覆盖的 Referer，requests 会和 Session 头自动合并，
+        # 不必整份 clone 一遍 CaseInsensitiveDict
+        resp = session.get(
+            DOWNLOAD_INFO_URL,
+            params={"format": "docx", "bbbs": law_id},
+            headers={
+                "Referer": f"https://flk.npc.gov.cn/detail?id={law_id}&fileId=&type=&title=",
+            },
+            timeout=60,
+        )
+        log.info("  download/pc 状态码：%s | Content-Type: %s",
+                 resp.status_code, resp.headers.get("Content-Type"))
+        resp.raise_for_status()
 
-    ctype = resp.headers.get("Content-Type", "")
-    if "application/json" not in ctype:
-        print("  ⚠ download/pc 返回的不是 JSON，前 300 字符：")
-        print(resp.text[:300])
-        return {"doc_path": "", "txt_path": ""}
+        ctype = resp.headers.get("Content-Type", "")
+        if "application/json" not in ctype:
+            log.warning("  ⚠ download/pc 返回的不是 JSON，前 300 字符：%s", resp.text[:300])
+            return {"doc_path": "", "txt_path": ""}
 
-    data = resp.json()
+        data = _loads_response(resp)
+        try:
+            ensure_dir(cache_dir)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            log.warning("  ⚠ 写入缓存失败（不影响下载）：%s", e)
     root = data.get("result") if isinstance(data, dict) and "result" in data else data
 
-    candidates = collect_doc_like_strings(root)
+    candidates = list(collect_doc_like_strings(root))
     if not candidates:
-        print("  ⚠ 在 JSON 中没有发现任何 .doc/.pdf/.wps 链接，"
-              "先把 JSON 存下来方便排查。")
-        debug_name = safe_filename(f"{gbrq}_{title}_download_info.json")
-        debug_path = os.path.join(save_dir, debug_name)
-        with open(debug_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print("  已保存 download_info JSON：", debug_path)
+        log.warning("  ⚠ 在 JSON 中没有发现任何 .doc/.pdf/.wps 链接。")
+        # 排查用的原始 JSON 落盘只在 debug 时做，免去每条缺附件记录的
+        # 缩进序列化 + 磁盘写（紧凑格式写出即可，排查时照样可读）
+        if debug:
+            debug_name = safe_filename(f"{gbrq}_{title}_download_info.json")
+            debug_path = os.path.join(save_dir, debug_name)
+            with open(debug_path, "wb") as f:
+                f.write(_dumps_bytes(data))
+            log.info("  已保存 download_info JSON：%s", debug_path)
         return {"doc_path": "", "txt_path": ""}
 
-    print(f"  在 JSON 中共发现疑似附件链接 {len(candidates)} 条：")
-    for p, v in candidates:
-        print("    ·", "/".join(p), "=>", v)
+    log.info("  在 JSON 中共发现疑似附件链接 %s 条：", len(candidates))
+    if log.isEnabledFor(logging.DEBUG):
+        for p, v in candidates:
+            log.debug("    · %s => %s", "/".join(p), v)
 
-    scored: List[Tuple[int, int, int, int, List[str], str]] = []
-    for path_keys, val in candidates:
+    # 只要最优的一条，min + key 一趟扫完，不用整表打分再排序
+    def _rank(pv: Tuple[Tuple[str, ...], str]):
+        path_keys, val = pv
         url_val = val.strip()
-        base_score = score_path(path_keys)
-        internal_flag = 1 if is_internal_url(url_val) else 0
-        https_flag = 1 if is_https(url_val) else 0
-        scored.append((
-            internal_flag,
-            -https_flag,
-            -base_score,
+        return (
+            1 if is_internal_url(url_val) else 0,
+            0 if is_https(url_val) else 1,
+            -score_path(path_keys),
             len(path_keys),
-            path_keys,
-            url_val,
-        ))
+        )
 
-    scored.sort()
-    best_internal, best_https_neg, best_neg_score, _, best_path_keys, best_val = scored[0]
-    print("  选中的最佳候选：", "/".join(best_path_keys), "=>", best_val,
-          "| internal =", best_internal,
-          "| https =", is_https(best_val))
+    best_path_keys, best_val = min(candidates, key=_rank)
+    best_val = best_val.strip()
+    log.info("  选中的最佳候选：%s => %s | internal = %s | https = %s",
+             "/".join(best_path_keys), best_val,
+             1 if is_internal_url(best_val) else 0, is_https(best_val))
 
     url = best_val
     if url.startswith('"') and url.endswith('"'):
@@ -411,30 +553,38 @@ def download_body_for_item(
     fname = safe_filename(f"{gbrq}_{title}{ext}")
     out_path = os.path.join(save_dir, fname)
 
-    print("  实际下载 URL：", url)
-    print("  保存文件名：", fname)
+    log.info("  实际下载 URL：%s", url)
+    log.debug("  保存文件名：%s", fname)
+
+    # 已有完整文件就不重复下载，重跑时直接复用
+    if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+        log.info("  已存在，跳过下载：%s", out_path)
+        txt_path = ""
+        if auto_txt and ext.lower() == ".docx":
+            txt_path = os.path.splitext(out_path)[0] + ".txt"
+            if not (os.path.exists(txt_path) and os.path.getsize(txt_path) > 0):
+                txt_path = _export_txt(out_path, txt_path, txt_executor)
+        return {"doc_path": out_path, "txt_path": txt_path}
 
     try:
-        r = session.get(url, timeout=120)
-        print("  下载响应状态码：", r.status_code)
-        r.raise_for_status()
+        # stream=True：附件按 64KB 块直接写盘，内存占用与文件大小无关
+        with session.get(url, timeout=120, stream=True) as r:
+            log.debug("  下载响应状态码：%s", r.status_code)
+            r.raise_for_status()
+            with open(out_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=65536):
+                    if chunk:
+                        f.write(chunk)
     except requests.RequestException as e:
-        print("  ❌ 下载失败：", e)
+        log.error("  ❌ 下载失败：%s", e)
         return {"doc_path": "", "txt_path": ""}
 
-    with open(out_path, "wb") as f:
-        f.write(r.content)
-    print("  ✅ 下载完成：", out_path)
+    log.info("  ✅ 下载完成：%s", out_path)
 
     txt_path = ""
     if auto_txt and ext.lower() == ".docx":
         txt_path = os.path.splitext(out_path)[0] + ".txt"
-        try:
-            docx_to_txt(out_path, txt_path)
-            print("  ✅ 已导出 TXT：", txt_path)
-        except Exception as e:
-            print("  ⚠ 转换 TXT 失败：", e)
-            txt_path = ""
+        txt_path = _export_txt(out_path, txt_path, txt_executor)
 
     return {"doc_path": out_path, "txt_path": txt_path}
 
@@ -450,6 +600,7 @@ def crawl_laws(
     cookie: str = "",
     auto_txt: bool = True,
     latest_only: bool = True,
+    max_workers: int = 4,
 ) -> List[Dict[str, str]]:
     """
     对外主入口函数：抓取指定关键词的法规正文，并返回下载结果列表。
@@ -463,6 +614,7 @@ def crawl_laws(
       cookie       : 可选 Cookie 字符串（否则使用 COOKIE_STR 或环境变量 FLK_COOKIE）
       auto_txt     : 是否对 docx 自动导出 txt，默认 True
       latest_only  : 是否只保留“同名法规”的最新版本（按标题归一化+公布日期比较），默认 True
+      max_workers  : 下载阶段并发线程数，默认 4；<=1 时退回串行下载（每条间隔 1 秒）
 
     返回：
       列表，每个元素为：
@@ -481,74 +633,74 @@ def crawl_laws(
     if exclude_words is None:
         exclude_words = list(DEFAULT_EXCLUDE_WORDS)
 
-    print(f"关键词：{keyword}")
-    print(f"最大翻页数：{max_pages}")
-    print(f"是否做本体过滤：{not no_filter}")
-    print(f"排除词：{exclude_words}")
-    print(f"是否只保留最新版本：{latest_only}")
-    print(f"保存目录：{save_dir}")
+    log.info("关键词：%s", keyword)
+    log.info("最大翻页数：%s", max_pages)
+    log.info("是否做本体过滤：%s", not no_filter)
+    log.info("排除词：%s", exclude_words)
+    log.info("是否只保留最新版本：%s", latest_only)
+    log.info("保存目录：%s", save_dir)
 
     session = new_session(cookie=cookie)
 
-    # 1. 搜索 & 收集记录
+    # 1. 搜索 & 收集记录（latest_only 的最新版本去重在收集时就完成）
     items = collect_main_body_laws(
         session=session,
         keyword=keyword,
         max_pages=max_pages,
         exclude_words=exclude_words,
         no_filter=no_filter,
+        latest_only=latest_only,
     )
 
-    # 1.5 根据 latest_only 做“同名法规只保留最新版本”的过滤
-    if items and latest_only:
-        latest_map: Dict[str, Dict[str, Any]] = {}
-        for it in items:
-            title_key = normalize_title_for_versioning(it["title"])
-            dt = parse_date(it.get("gbrq", ""))
-            if title_key not in latest_map:
-                latest_map[title_key] = it
-            else:
-                old = latest_map[title_key]
-                if parse_date(old.get("gbrq", "")) < dt:
-                    latest_map[title_key] = it
-        filtered_items = list(latest_map.values())
-        print(f"按标题归一化后，{len(items)} 条候选中保留最新版本 {len(filtered_items)} 条。")
-        items = filtered_items
-
     # 保存清单 JSON（是最终准备用于下载的列表）
     list_path = os.path.join(save_dir, f"{keyword}_本体清单_flk.json")
     with open(list_path, "w", encoding="utf-8") as f:
         json.dump(items, f, ensure_ascii=False, indent=2)
-    print("\n已将清单保存到：", list_path)
+    log.info("已将清单保存到：%s", list_path)
 
     if not items:
-        print("⚠ 没有任何候选，结束。")
+        log.warning("⚠ 没有任何候选，结束。")
         return []
 
-    # 2. 逐条下载正文
+    # 2. 下载正文：多线程并发（下载是 I/O 密集，Session 线程安全，
+    #    连接池早已按并发配好）；max_workers<=1 时退回串行 + 限速
     results: List[Dict[str, str]] = []
-    success = 0
-    for item in items:
-        paths = download_body_for_item(
-            session=session,
-            item=item,
-            save_dir=save_dir,
-            auto_txt=auto_txt,
-        )
-        merged = {
-            "id": item["id"],
-            "title": item["title"],
-            "gbrq": item["gbrq"],
-            "doc_path": paths.get("doc_path", ""),
-            "txt_path": paths.get("txt_path", ""),
-        }
-        if merged["doc_path"]:
-            success += 1
-        results.append(merged)
-        time.sleep(1.0)
+    # docx→txt 的 CPU 工作丢进小线程池，与网络下载重叠
+    with ThreadPoolExecutor(max_workers=2) as txt_pool:
+
+        def _download_one(item: Dict[str, Any]) -> Dict[str, str]:
+            paths = download_body_for_item(
+                session=session,
+                item=item,
+                save_dir=save_dir,
+                auto_txt=auto_txt,
+                txt_executor=txt_pool,
+            )
+            return {
+                "id": item["id"],
+                "title": item["title"],
+                "gbrq": item["gbrq"],
+                "doc_path": paths.get("doc_path", ""),
+                "txt_path": paths.get("txt_path", ""),
+            }
+
+        if max_workers <= 1:
+            for item in items:
+                results.append(_download_one(item))
+                time.sleep(1.0)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as dl_pool:
+                # map 保证结果顺序与 items 一致
+                results = list(dl_pool.map(_download_one, items))
 
-    print(f"\n共 {len(items)} 条待下载记录，成功下载 {success} 条。")
-    print("保存目录：", os.path.abspath(save_dir))
+        # 收尾：把还在后台转换的 txt 补回真实路径（失败为空串）
+        for merged in results:
+            if isinstance(merged["txt_path"], Future):
+                merged["txt_path"] = merged["txt_path"].result()
+
+    success = sum(1 for r in results if r["doc_path"])
+    log.info("共 %s 条待下载记录，成功下载 %s 条。", len(items), success)
+    log.info("保存目录：%s", os.path.abspath(save_dir))
 
     return results
 
@@ -595,6 +747,12 @@ def parse_args():
         action="store_true",
         help="不要自动从 docx 导出 txt"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="下载阶段并发线程数，1 表示串行限速下载（默认：4）"
+    )
     parser.add_argument(
         "--all-versions",
         action="store_true",
@@ -604,6 +762,10 @@ def parse_args():
 
 
 def main_cli():
+    # 命令行跑时把日志打到 stdout，保持原来 print 的观感；
+    # 被当库 import 时不动全局配置，由调用方决定
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     args = parse_args()
 
     exclude_words = list(DEFAULT_EXCLUDE_WORDS)
@@ -620,6 +782,7 @@ def main_cli():
         cookie=args.cookie,
         auto_txt=not args.no_txt,
         latest_only=not args.all_versions,
+        max_workers=args.workers,
     )
 
     # 输出一下结果
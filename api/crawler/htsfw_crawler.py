@@ -6,7 +6,7 @@
   - 按关键词搜索示范合同（调用 /api/content/SearchTemplates 接口），获取合同 id 列表；
   - 访问 /View?id=... 详情页，解析标题 / 合同编号；
   - 调用 /api/File/DownTemplate?id=...&type=2 下载 PDF 文档；
-  - 使用 pdfplumber 将 PDF 导出为 txt 文本；
+  - 使用 PyMuPDF 将 PDF 导出为 txt 文本；
   - 既可以作为命令行工具使用，也可以作为库被其他 Python 代码调用。
 
 使用示例（命令行）：
@@ -17,19 +17,47 @@
   python htsfw_crawler.py --ids 5e068390-d87c-4ea5-aa83-18a8ed36e3ae
 
 依赖：
-  pip install requests beautifulsoup4 pdfplumber
+  pip install requests beautifulsoup4 pymupdf
 """
 
 import os
 import re
+import json
 import time
+import shutil
+import logging
 import argparse
+import unicodedata
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from typing import Any, List, Dict, Optional
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup  # pip install beautifulsoup4
-import pdfplumber              # pip install pdfplumber
+
+# orjson 的解码比标准库快数倍，按可选依赖处理：缺失时回退 stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 首选 PyMuPDF（C 层抽取，比 pdfminer 系快一个量级）；
+# 没装的环境退回 pdfplumber，保持功能可用
+try:
+    import pymupdf             # pip install pymupdf
+except ImportError:
+    pymupdf = None
+    import pdfplumber          # pip install pdfplumber
+
+# 作为库被 import 时由调用方决定 handler/级别；命令行入口里 basicConfig。
+# pdfplumber 回退路径下顺手压掉 pdfminer 逐对象的调试日志，
+# 它在大 PDF 上本身就是个性能坑
+log = logging.getLogger("htsfw_crawler")
+logging.getLogger("pdfminer").setLevel(logging.WARNING)
+logging.getLogger("pdfplumber").setLevel(logging.WARNING)
 
 # ----------------- 常量配置 -----------------
 
@@ -39,39 +67,185 @@ BASE_URL = "https://htsfwb.samr.gov.cn"
 #   GET /api/content/SearchTemplates?key=买卖&loc=true&p=1
 SEARCH_API_URL = BASE_URL + "/api/content/SearchTemplates"
 
+# (keyword, page, loc) -> (etag, 解析后的响应)；同进程内重复搜索走 304
+_ETAG_CACHE: Dict[tuple, tuple] = {}
+
 
 # ----------------- 工具函数 -----------------
 
+# 文件名非法字符 → 下划线 的映射表；str.translate 是 C 层逐字符查表，
+# 比正则替换快一个量级
+_FILENAME_TABLE = str.maketrans({c: "_" for c in '\\/:*?"<>|'})
+
+
 def ensure_dir(path: str) -> None:
-    """确保目录存在。"""
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    """确保目录存在（exist_ok 自带幂等，不必先 stat 一次）。"""
+    os.makedirs(path, exist_ok=True)
 
 
 def safe_filename(name: str) -> str:
     """将任意标题转换为适合作为文件名的字符串。"""
-    name = re.sub(r"[\\/:*?\"<>|]", "_", name)
-    name = name.strip()
-    return name or "unnamed"
+    # NFC 归一化让同一 CJK 标题在不同系统上生成一致的文件名
+    name = unicodedata.normalize("NFC", name)
+    return name.translate(_FILENAME_TABLE).strip() or "unnamed"
+
+
+# 断点续爬清单：记录每个合同 id 已下载的结果
+MANIFEST_NAME = ".crawl_manifest.json"
+
+
+def _load_manifest(save_dir: str) -> Dict[str, Dict[str, Any]]:
+    """读取续爬清单，没有或损坏时返回空 dict。"""
+    path = os.path.join(save_dir, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_manifest(save_dir: str, manifest: Dict[str, Dict[str, Any]]) -> None:
+    """落盘续爬清单（紧凑格式即可）。"""
+    path = os.path.join(save_dir, MANIFEST_NAME)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+    except Exception as e:
+        log.warning("⚠ 写入续爬清单失败（不影响抓取结果）：%s", e)
+
+
+# 页数达到该阈值才启用多线程抽取，小文件线程开销不划算
+_MIN_PARALLEL_PAGES = 8
+
+# 纯文本抽取标志：保留空白、不为 CJK 字形间距生成多余空格，
+# 并跳过图形/印章等非文本内容的解析开销
+_TEXT_FLAGS = (
+    pymupdf.TEXT_PRESERVE_WHITESPACE | pymupdf.TEXT_INHIBIT_SPACES
+    if pymupdf is not None else 0
+)
+
+
+def _extract_pages(pdf_path: str, page_indexes: range) -> List[str]:
+    """抽取指定页区间的文本。每个线程打开自己的 Document，规避 MuPDF 线程限制。"""
+    doc = pymupdf.open(pdf_path)
+    try:
+        return [
+            doc.load_page(i).get_text("text", flags=_TEXT_FLAGS).strip()
+            for i in page_indexes
+        ]
+    finally:
+        doc.close()
 
 
-def pdf_to_txt(pdf_path: str, txt_path: str) -> None:
-    """使用 pdfplumber 将 PDF 内容导出为 txt 文本（utf-8）。"""
-    texts: List[str] = []
+def _extract_one_page_pdfplumber(pdf_path: str, index: int) -> str:
+    """子进程里抽取单页文本（pdfplumber 的解释器循环持 GIL，线程无益）。"""
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            texts.append(page_text.strip())
+        return (pdf.pages[index].extract_text() or "").strip()
+
+
+def _pdf_to_txt_pdfplumber(pdf_path: str, txt_path: str) -> None:
+    """pdfplumber 回退路径：明显慢于 PyMuPDF，仅保底用。
+
+    多页文档用进程池逐页并行（pdfminer 的抽取是纯 Python CPU 活），
+    小文档仍串行，省掉进程启动开销。
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        if page_count < _MIN_PARALLEL_PAGES:
+            texts = [(page.extract_text() or "").strip() for page in pdf.pages]
+        else:
+            texts = []
+
+    if page_count >= _MIN_PARALLEL_PAGES:
+        workers = min(os.cpu_count() or 1, 4)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map 保证结果按页序返回
+            texts = list(executor.map(
+                _extract_one_page_pdfplumber,
+                repeat(pdf_path),
+                range(page_count),
+            ))
+
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join(texts))
+
+
+# 首页文本少于该长度且带图片时判定为扫描件，不做全文抽取
+_MIN_PROBE_TEXT = 20
+
+
+def _is_scanned_pdf(doc) -> bool:
+    """粗探测扫描件：看首页，几乎没有文本但有整页图片的就是。"""
+    if doc.page_count == 0:
+        return False
+    page0 = doc.load_page(0)
+    probe = page0.get_text("text", flags=_TEXT_FLAGS).strip()
+    return len(probe) < _MIN_PROBE_TEXT and bool(page0.get_images())
+
+
+def pdf_to_txt(pdf_path: str, txt_path: str) -> bool:
+    """使用 PyMuPDF 将 PDF 内容导出为 txt 文本（utf-8）。多页文档按页区间并行抽取。
+
+    扫描件（首页几乎无文本且有图片）直接跳过，不写 TXT，返回 False；
+    成功写出 TXT 时返回 True。
+    """
+    if pymupdf is None:
+        _pdf_to_txt_pdfplumber(pdf_path, txt_path)
+        return True
+
+    doc = pymupdf.open(pdf_path)
+    try:
+        if _is_scanned_pdf(doc):
+            log.info("    ⚠ 疑似扫描件（首页无文本层），跳过 TXT 导出：%s", pdf_path)
+            return False
+        page_count = doc.page_count
+        if page_count < _MIN_PARALLEL_PAGES:
+            texts: List[str] = [
+                page.get_text("text", flags=_TEXT_FLAGS).strip() for page in doc
+            ]
+        else:
+            texts = []
+    finally:
+        doc.close()
+
+    if page_count >= _MIN_PARALLEL_PAGES:
+        # 文本抽取在 MuPDF 的 C 层释放 GIL，线程池可以真正并行
+        workers = min(os.cpu_count() or 1, 4)
+        step = (page_count + workers - 1) // workers
+        ranges = [
+            range(start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            for part in executor.map(lambda r: _extract_pages(pdf_path, r), ranges):
+                texts.extend(part)
+
     content = "\n\n".join(texts)
     with open(txt_path, "w", encoding="utf-8") as f:
         f.write(content)
+    return True
 
 
 # ----------------- Session -----------------
 
 def new_session() -> requests.Session:
-    """创建一个带通用 Header 的 Session。"""
+    """创建一个带通用 Header、连接池和自动重试的 Session。"""
     s = requests.Session()
+
+    # 连接池 + 重试：复用到同一主机的 TCP/TLS 连接，临时性错误自动退避重试
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+        ),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+
     s.headers.update({
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -105,7 +279,7 @@ def fetch_search_page(
         "loc": "true" if loc else "false",
         "p": page,
     }
-    print(f"请求搜索接口，第 {page} 页：", params)
+    log.debug("请求搜索接口，第 %s 页：%s", page, params)
 
     headers = {
         "Referer": f"{BASE_URL}/List?key={quote(keyword)}",
@@ -113,22 +287,38 @@ def fetch_search_page(
         "Accept": "application/json, text/plain, */*",
     }
 
+    # 条件请求：之前拿到过 ETag 就带上 If-None-Match，
+    # 目录没变时服务器答 304，零字节传输、免重新解析
+    cache_key = (keyword, page, loc)
+    cached = _ETAG_CACHE.get(cache_key)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+
     resp = session.get(
         SEARCH_API_URL,
         params=params,
         headers=headers,
         timeout=15,
     )
-    print("  状态码：", resp.status_code)
+    log.debug("  状态码：%s", resp.status_code)
+
+    if resp.status_code == 304 and cached is not None:
+        log.debug("  命中 ETag 缓存（304）")
+        return cached[1]
+
     resp.raise_for_status()
 
     ctype = resp.headers.get("Content-Type", "")
     if "application/json" not in ctype:
-        print("  ⚠ SearchTemplates 返回的不是 JSON，前 200 字符：")
-        print(resp.text[:200])
+        log.warning("  ⚠ SearchTemplates 返回的不是 JSON，前 200 字符：%s", resp.text[:200])
         return {}
 
-    data = resp.json()
+    # orjson 直接吃 bytes，免一次解码；没装时退回 resp.json()
+    data = orjson.loads(resp.content) if orjson is not None else resp.json()
+
+    etag = resp.headers.get("ETag")
+    if etag:
+        _ETAG_CACHE[cache_key] = (etag, data)
     return data
 
 
@@ -142,19 +332,30 @@ def search_contracts(
     按关键字搜索合同示范文本，返回记录列表：
       [{"id": "...", "title": "...", "brief": "...", "meta": {...}}, ...]
     """
-    all_items: List[Dict[str, Any]] = []
+    # 按 id 去重：边收集边写入 dict，保持插入顺序，省掉整轮二次遍历
+    uniq: Dict[str, Dict[str, Any]] = {}
 
-    for page in range(1, max_pages + 1):
-        print(f"\n==== 搜索关键字：{keyword}，第 {page} 页 ====")
-        data = fetch_search_page(session, keyword, page=page, loc=loc)
+    # 翻页请求相互独立，先并发抓全部页面，再按页序处理；
+    # 单页场景保持原样，不引入线程池开销
+    if max_pages <= 1:
+        pages_data = [fetch_search_page(session, keyword, page=1, loc=loc)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_pages, 4)) as executor:
+            pages_data = list(executor.map(
+                lambda p: fetch_search_page(session, keyword, page=p, loc=loc),
+                range(1, max_pages + 1),
+            ))
+
+    for page, data in enumerate(pages_data, start=1):
+        log.info("==== 搜索关键字：%s，第 %s 页 ====", keyword, page)
         if not data:
-            print("  ⚠ 本页无数据，提前结束。")
+            log.info("  ⚠ 本页无数据，提前结束。")
             break
 
         rows = data.get("Data") or []
         total = data.get("Total")
         total_page = data.get("TotalPage") or data.get("TotalPages") or None
-        print(f"  当前页记录数：{len(rows)}，总数：{total}，总页数：{total_page}")
+        log.info("  当前页记录数：%s，总数：%s，总页数：%s", len(rows), total, total_page)
 
         if not rows:
             break
@@ -163,38 +364,35 @@ def search_contracts(
             cid = row.get("Id") or row.get("id")
             title = row.get("Title") or row.get("title") or ""
             brief = row.get("Brief") or row.get("brief") or ""
-            if not cid:
+            if not cid or cid in uniq:
                 continue
-            all_items.append({
+            uniq[cid] = {
                 "id": cid,
                 "title": title.strip(),
                 "brief": brief.strip(),
                 "meta": row,
-            })
+            }
 
         if total_page is not None and page >= int(total_page):
             break
 
-        time.sleep(1.0)
-
-    print(f"\n搜索结果总数（去重前）：{len(all_items)}")
-    uniq: Dict[str, Dict[str, Any]] = {}
-    for it in all_items:
-        cid = it["id"]
-        if cid not in uniq:
-            uniq[cid] = it
     result = list(uniq.values())
-    print(f"去重后：{len(result)} 条")
+    log.info("搜索结果（按 id 去重后）：%s 条", len(result))
     return result
 
 
 # ----------------- 解析 /View 页面 -----------------
 
+# 合同编号样式，模块级预编译；如 "GF—2000—0104" / "SF-2020-0102"
+_CODE_RE = re.compile(r"(GF|SF)[—\-]\s*\d{4}[—\-]\d+")
+
+
 def parse_view_page(html: str) -> Dict[str, Any]:
     """
     解析 /View?id=... 页面，提取标题、合同编号（如果能抓到）。
     """
-    soup = BeautifulSoup(html, "html.parser")
+    # lxml 是 C 实现的解析器，比纯 Python 的 html.parser 快数倍
+    soup = BeautifulSoup(html, "lxml")
     res: Dict[str, Any] = {
         "title": "",
         "code": "",
@@ -210,9 +408,13 @@ def parse_view_page(html: str) -> Dict[str, Any]:
         if title_tag:
             res["title"] = title_tag.get_text(strip=True).split(" - ")[0]
 
-    # 2) 合同编号：比如 "GF—2000—0104" / "SF-2020-0102"
-    full_text = soup.get_text("\n", strip=True)
-    m = re.search(r"(GF|SF)[—\-]\s*\d{4}[—\-]\d+", full_text)
+    # 2) 合同编号：编号总在页头附近，只扫前几十个标题/段落节点的文本，
+    #    不为此把整棵文档树的文本都拼出来
+    header_text = "\n".join(
+        tag.get_text(strip=True)
+        for tag in soup.find_all(["h1", "h2", "p", "span"], limit=50)
+    )
+    m = _CODE_RE.search(header_text)
     if m:
         res["code"] = m.group(0).replace(" ", "")
 
@@ -221,6 +423,18 @@ def parse_view_page(html: str) -> Dict[str, Any]:
 
 # ----------------- 下载 PDF -----------------
 
+def _txt_export_job(pdf_path: str, txt_path: str) -> str:
+    """执行 PDF→TXT 导出，成功返回 txt 路径，失败/跳过返回空串。"""
+    try:
+        if pdf_to_txt(pdf_path, txt_path):
+            log.info("    ✅ 已导出 TXT（pdf）：%s", txt_path)
+            return txt_path
+        return ""
+    except Exception as e:
+        log.warning("    ⚠ TXT 导出失败（pdf）：%s", e)
+        return ""
+
+
 def download_pdf_for_contract(
     session: requests.Session,
     contract_id: str,
@@ -228,9 +442,12 @@ def download_pdf_for_contract(
     code: str,
     save_dir: str,
     auto_txt: bool = True,
+    force: bool = False,
+    txt_executor=None,
 ) -> Dict[str, Any]:
     """
     下载 PDF（type=2），并尝试导出 txt。
+    已存在的非空 PDF/TXT 默认直接复用（force=True 可强制重新下载）。
 
     ✅ 文件名规则：
        有编号：<合同编号>_<标题>.pdf
@@ -240,17 +457,7 @@ def download_pdf_for_contract(
       {"type": "pdf", "path": "xxx.pdf 或空串", "txt_path": "xxx.txt 或空串"}
     """
     url = f"{BASE_URL}/api/File/DownTemplate?id={contract_id}&type=2"
-    print(f"  尝试下载 PDF：{url}")
-
-    try:
-        r = session.get(url, timeout=60)
-        print("    状态码：", r.status_code)
-        if r.status_code != 200 or not r.content:
-            print("    ⚠ 未成功下载 PDF，跳过。")
-            return {"type": "pdf", "path": "", "txt_path": ""}
-    except Exception as e:
-        print("    ❌ 请求失败：", e)
-        return {"type": "pdf", "path": "", "txt_path": ""}
+    log.info("  尝试下载 PDF：%s", url)
 
     # 文件名：严格用 “编号+标题” 或 “标题”
     if code:
@@ -261,19 +468,51 @@ def download_pdf_for_contract(
     filename = safe_filename(base_name) + ".pdf"
     out_path = os.path.join(save_dir, filename)
 
-    with open(out_path, "wb") as f:
-        f.write(r.content)
-    print("    ✅ 已保存 PDF：", out_path)
+    # 重跑/断点续爬：本地已有非空 PDF 时直接复用，省掉网络和落盘
+    if not force and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+        log.info("    ✅ PDF 已存在，跳过下载：%s", out_path)
+    else:
+        # 先写 .part 临时名，成功后原子 rename，中断不会留下残缺的 .pdf
+        part_path = out_path + ".part"
+        try:
+            # stream=True：响应体按块直接落盘，不在内存里整份缓冲；
+            # PDF 本身已压缩，声明 identity 避免传输层再做一次压缩/解压
+            with session.get(
+                url,
+                timeout=60,
+                stream=True,
+                headers={"Accept-Encoding": "identity"},
+            ) as r:
+                log.debug("    状态码：%s", r.status_code)
+                if r.status_code != 200:
+                    log.warning("    ⚠ 未成功下载 PDF，跳过。")
+                    return {"type": "pdf", "path": "", "txt_path": ""}
+                with open(part_path, "wb") as f:
+                    shutil.copyfileobj(r.raw, f, length=1 << 16)
+        except Exception as e:
+            log.error("    ❌ 请求失败：%s", e)
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            return {"type": "pdf", "path": "", "txt_path": ""}
+
+        if not os.path.getsize(part_path):
+            log.warning("    ⚠ PDF 内容为空，跳过。")
+            os.remove(part_path)
+            return {"type": "pdf", "path": "", "txt_path": ""}
+        os.replace(part_path, out_path)
+        log.info("    ✅ 已保存 PDF：%s", out_path)
 
     txt_path = ""
     if auto_txt:
         txt_path = os.path.splitext(out_path)[0] + ".txt"
-        try:
-            pdf_to_txt(out_path, txt_path)
-            print("    ✅ 已导出 TXT（pdf）：", txt_path)
-        except Exception as e:
-            print("    ⚠ TXT 导出失败（pdf）：", e)
-            txt_path = ""
+        if not force and os.path.exists(txt_path) and os.path.getsize(txt_path) > 0:
+            log.info("    ✅ TXT 已存在，跳过导出：%s", txt_path)
+        elif txt_executor is not None:
+            # 抽取丢给专门的线程池，下载线程立刻腾出来发下一个请求；
+            # 此时 txt_path 是 Future，由 crawl_contracts 收尾时取回
+            txt_path = txt_executor.submit(_txt_export_job, out_path, txt_path)
+        else:
+            txt_path = _txt_export_job(out_path, txt_path)
 
     return {"type": "pdf", "path": out_path, "txt_path": txt_path}
 
@@ -283,6 +522,8 @@ def download_for_contract(
     contract_id: str,
     save_dir: str,
     auto_txt: bool = True,
+    force: bool = False,
+    txt_executor=None,
 ) -> Dict[str, Any]:
     """
     访问单个合同详情页 /View?id=...，
@@ -299,14 +540,14 @@ def download_for_contract(
       }
     """
     view_url = f"{BASE_URL}/View?id={contract_id}"
-    print(f"\n--- 抓取合同详情：{view_url} ---")
+    log.info("--- 抓取合同详情：%s ---", view_url)
 
     try:
         resp = session.get(view_url, timeout=20)
-        print("  详情页状态码：", resp.status_code)
+        log.debug("  详情页状态码：%s", resp.status_code)
         resp.raise_for_status()
     except Exception as e:
-        print("  ❌ 获取详情页失败：", e)
+        log.error("  ❌ 获取详情页失败：%s", e)
         return {
             "id": contract_id,
             "title": "",
@@ -318,9 +559,9 @@ def download_for_contract(
     title = info.get("title") or contract_id
     code = info.get("code") or ""
 
-    print(f"  标题：{title}")
+    log.info("  标题：%s", title)
     if code:
-        print(f"  合同编号：{code}")
+        log.info("  合同编号：%s", code)
 
     pdf_info = download_pdf_for_contract(
         session=session,
@@ -329,6 +570,8 @@ def download_for_contract(
         code=code,
         save_dir=save_dir,
         auto_txt=auto_txt,
+        force=force,
+        txt_executor=txt_executor,
     )
 
     files: List[Dict[str, Any]] = []
@@ -336,7 +579,7 @@ def download_for_contract(
         files.append(pdf_info)
 
     if not files:
-        print("  ⚠ 未能成功下载可用的 PDF 文档。")
+        log.warning("  ⚠ 未能成功下载可用的 PDF 文档。")
 
     return {
         "id": contract_id,
@@ -354,6 +597,8 @@ def crawl_contracts(
     max_pages: int = 1,
     save_dir: str = "",
     auto_txt: bool = True,
+    max_workers: int = 4,
+    force: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     主入口函数：按关键字搜索 / 或 按给定 id 列表抓取合同范文。
@@ -363,7 +608,9 @@ def crawl_contracts(
       ids      : 明确的合同 id 列表（可选），形如 "5e068390-d87c-4ea5-aa83-18a8ed36e3ae"；
       max_pages: 搜索翻页数上限，仅在 keyword 模式下生效；
       save_dir : 保存目录，默认 "合同示范文本_下载"；
-      auto_txt : 是否自动从 PDF 导出 txt。
+      auto_txt : 是否自动从 PDF 导出 txt；
+      max_workers: 并发下载线程数，1 表示退回串行逐条下载；
+      force    : 是否忽略本地已有文件强制重新下载。
 
     返回：
       每个元素结构参考 download_for_contract 的返回值。
@@ -374,38 +621,78 @@ def crawl_contracts(
 
     session = new_session()
 
+    # 去重用 set 做成员判断（O(1)），列表只负责保持顺序
     contract_ids: List[str] = []
+    seen_ids: set = set()
+
+    def _add_id(cid: str) -> None:
+        if cid not in seen_ids:
+            seen_ids.add(cid)
+            contract_ids.append(cid)
 
     # 1) 如果显式给了 ids，就直接用 ids
-    if ids:
-        contract_ids.extend(ids)
+    for cid in ids or []:
+        _add_id(cid)
 
     # 2) 如果给了 keyword，则通过搜索接口拿 id
     if keyword:
-        search_items = search_contracts(session, keyword, max_pages=max_pages)
-        for it in search_items:
-            cid = it["id"]
-            if cid not in contract_ids:
-                contract_ids.append(cid)
+        for it in search_contracts(session, keyword, max_pages=max_pages):
+            _add_id(it["id"])
 
-    contract_ids = list(dict.fromkeys(contract_ids))  # 去重并保持顺序
-
-    print("\n待抓取合同数量：", len(contract_ids))
+    log.info("待抓取合同数量：%s", len(contract_ids))
     if not contract_ids:
-        print("⚠ 没有任何待抓取的合同 id。")
+        log.warning("⚠ 没有任何待抓取的合同 id。")
         return []
 
-    results: List[Dict[str, Any]] = []
-    for cid in contract_ids:
-        info = download_for_contract(
-            session=session,
-            contract_id=cid,
-            save_dir=save_dir,
-            auto_txt=auto_txt,
-        )
-        results.append(info)
-        time.sleep(1.0)
+    # 续爬清单：命中且文件还在时整条跳过（连详情页都不用再访问）
+    manifest = {} if force else _load_manifest(save_dir)
 
+    results: List[Dict[str, Any]] = []
+    # PDF→TXT 抽取走专门的小线程池：下载线程写完 PDF 就能去发下一个
+    # 请求，不用守着 CPU 抽取把连接槽占住
+    with ThreadPoolExecutor(max_workers=2) as extract_pool:
+
+        def _crawl_one(cid: str) -> Dict[str, Any]:
+            if not force:
+                cached = manifest.get(cid)
+                if (
+                    cached
+                    and cached.get("files")
+                    and all(os.path.exists(f.get("path", "")) for f in cached["files"])
+                ):
+                    log.info("--- 清单命中，跳过抓取：%s（%s） ---", cid, cached.get("title", ""))
+                    return cached
+            return download_for_contract(
+                session=session,
+                contract_id=cid,
+                save_dir=save_dir,
+                auto_txt=auto_txt,
+                force=force,
+                txt_executor=extract_pool,
+            )
+
+        if max_workers <= 1:
+            # 串行模式：保留逐条间隔，行为与旧版一致
+            for cid in contract_ids:
+                results.append(_crawl_one(cid))
+                time.sleep(1.0)
+        else:
+            # 下载/解析以 I/O 等待为主，线程池把网络延迟重叠起来；
+            # Session 对并发 GET 是线程安全的，结果顺序与 id 顺序一致
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_crawl_one, contract_ids))
+
+        # 收尾：等后台抽取完成，把 Future 换回真实 txt 路径
+        for result in results:
+            for f in result.get("files", []):
+                if isinstance(f.get("txt_path"), Future):
+                    f["txt_path"] = f["txt_path"].result()
+
+    # 全部路径落定后再更新清单（Future 不能进 JSON）
+    for result in results:
+        if result.get("files"):
+            manifest[result["id"]] = result
+    _save_manifest(save_dir, manifest)
     return results
 
 
@@ -441,10 +728,25 @@ def parse_args():
         action="store_true",
         help="不要自动从 PDF 导出 txt"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="并发下载线程数，1 表示串行下载（默认：4）"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="忽略本地已下载的 PDF/TXT，强制重新下载"
+    )
     return parser.parse_args()
 
 
 def main_cli():
+    # 命令行跑时把日志打到 stdout，保持原来 print 的观感；
+    # 被当库 import 时不动全局配置，由调用方决定
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     args = parse_args()
 
     id_list: Optional[List[str]] = None
@@ -457,6 +759,8 @@ def main_cli():
         max_pages=args.max_pages,
         save_dir=args.save_dir,
         auto_txt=not args.no_txt,
+        max_workers=args.workers,
+        force=args.force,
     )
 
     print("\n=== 抓取完成，结果摘要 ===")
@@ -2,8 +2,11 @@
 向量化模块 - 使用BGE模型
 """
 import config
+import hashlib
+import os
 import torch
 import numpy as np
+from collections import OrderedDict
 from typing import List, Union
 from transformers import AutoTokenizer, AutoModel
 from sentence_transformers import SentenceTransformer
@@ -31,34 +34,163 @@ class BGEModel:
         
         # 加载模型和tokenizer
         try:
-            self.model = SentenceTransformer(self.model_name, device=self.device)
+            self.model = self._load_sentence_transformer()
             self.use_sentence_transformer = True
         except:
             # 使用transformers方式加载
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
             self.model = AutoModel.from_pretrained(self.model_name).to(self.device)
             self.use_sentence_transformer = False
-            
+
         self.model.eval()
+
+        # CUDA 下权重转半精度：transformers 回退路径前向时已有 autocast，
+        # 这里只处理 sentence-transformers 路径
+        if (
+            getattr(config, "USE_FP16", False)
+            and self.device.startswith("cuda")
+            and self.use_sentence_transformer
+        ):
+            self.model.half()
+
+        # 内容哈希 → 向量 的 LRU 缓存；1 万条 1024 维 fp32 约 40MB
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_max = 10000
+
+        # 磁盘缓存：内存未命中时查磁盘，跨进程/重启复用已算过的向量
+        self._disk_cache_dir = getattr(config, "EMBED_CACHE_DIR", None)
+        if self._disk_cache_dir:
+            os.makedirs(self._disk_cache_dir, exist_ok=True)
+
+        # 可选：torch.compile 编译 forward，消除逐算子的 Python 分发开销。
+        # 首个 batch 会付一次编译成本，长批量入库时净赚
+        if getattr(config, "TORCH_COMPILE", False) and hasattr(torch, "compile"):
+            try:
+                if self.use_sentence_transformer:
+                    # ST 的真正 encoder 藏在第一个模块里
+                    self.model[0].auto_model = torch.compile(
+                        self.model[0].auto_model, mode="reduce-overhead"
+                    )
+                else:
+                    self.model = torch.compile(self.model, mode="reduce-overhead")
+                print("已启用 torch.compile 编译编码器")
+            except Exception as e:
+                print(f"torch.compile 失败，继续用未编译模型: {e}")
+
+        # 预热：把编译/半精度首次前向的代价付在启动时，不落在首个请求上
+        if self.device.startswith("cuda") and self.use_sentence_transformer:
+            try:
+                self.model.encode(["预热"] * 8, batch_size=8, show_progress_bar=False)
+            except Exception as e:
+                print(f"编码器预热失败（忽略）: {e}")
         
-    def encode(self, texts: Union[str, List[str]], 
+    def encode(self, texts: Union[str, List[str]],
                normalize: bool = None) -> np.ndarray:
         """
         编码文本为向量
-        
+
+        相同文本（按内容哈希）直接命中内存缓存，不再走模型前向——
+        合同场景里模板条款大量重复，重复入库/检索时收益明显。
+
         Args:
             texts: 文本或文本列表
             normalize: 是否归一化
-            
+
         Returns:
             向量数组
         """
         normalize = normalize if normalize is not None else config.NORMALIZE_EMBEDDINGS
         is_single_text = isinstance(texts, str)
-        
+
         if is_single_text:
             texts = [texts]
-            
+
+        # 先查内存，内存没有再查磁盘，都没有才进模型
+        keys = [self._cache_key(t, normalize) for t in texts]
+        miss_indexes = []
+        for i, k in enumerate(keys):
+            if k in self._cache:
+                continue
+            disk_emb = self._disk_get(k)
+            if disk_emb is not None:
+                self._cache_insert(k, disk_emb)
+            else:
+                miss_indexes.append(i)
+
+        if miss_indexes:
+            miss_embeddings = self._encode_impl(
+                [texts[i] for i in miss_indexes], normalize
+            )
+            for i, emb in zip(miss_indexes, miss_embeddings):
+                emb = np.asarray(emb)
+                self._cache_insert(keys[i], emb)
+                self._disk_put(keys[i], emb)
+
+        embeddings = np.stack([self._cache[k] for k in keys])
+        # 命中的项移到队尾（LRU 语义）
+        for k in keys:
+            self._cache.move_to_end(k)
+
+        if is_single_text:
+            return np.squeeze(embeddings, axis=0)
+        return embeddings
+
+    def _load_sentence_transformer(self) -> SentenceTransformer:
+        """
+        加载 sentence-transformers 模型。
+
+        纯 CPU 部署且配置了 BGE_QUANTIZATION="onnx-int8" 时优先走
+        INT8 ONNX 后端（CPU 吞吐约 2-3 倍）；加载失败退回 FP32。
+        """
+        if (
+            getattr(config, "BGE_QUANTIZATION", None) == "onnx-int8"
+            and self.device == "cpu"
+        ):
+            try:
+                return SentenceTransformer(
+                    self.model_name,
+                    device=self.device,
+                    backend="onnx",
+                    model_kwargs={"file_name": "onnx/model_qint8_avx512_vnni.onnx"},
+                )
+            except Exception as e:
+                print(f"INT8 ONNX 后端加载失败，退回 FP32: {e}")
+        return SentenceTransformer(self.model_name, device=self.device)
+
+    def _cache_key(self, text: str, normalize: bool) -> str:
+        """内容寻址键：同时充当内存缓存键和磁盘缓存文件名。"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.model_name.encode("utf-8"))
+        h.update(b"|1|" if normalize else b"|0|")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def _cache_insert(self, key: str, emb: np.ndarray) -> None:
+        self._cache[key] = emb
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    def _disk_get(self, key: str):
+        if not self._disk_cache_dir:
+            return None
+        path = os.path.join(self._disk_cache_dir, key + ".npy")
+        try:
+            return np.load(path).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key: str, emb: np.ndarray) -> None:
+        if not self._disk_cache_dir:
+            return
+        path = os.path.join(self._disk_cache_dir, key + ".npy")
+        try:
+            # fp16 落盘：体积减半，读回时转 float32
+            np.save(path, emb.astype(np.float16))
+        except OSError:
+            pass
+
+    def _encode_impl(self, texts: List[str], normalize: bool) -> np.ndarray:
+        """真正的模型前向：输入文本列表，输出二维向量数组。"""
         if self.use_sentence_transformer:
             # 使用sentence-transformers接口
             embeddings = self.model.encode(
@@ -68,52 +200,121 @@ class BGEModel:
             )
         else:
             # 使用transformers接口
+            # pad_to_multiple_of=8：序列长度对齐到 8 的倍数，
+            # fp16 下 cuBLAS 才会选 Tensor Core 的 GEMM 内核
             encoded_input = self.tokenizer(
-                texts, 
-                padding=True, 
-                truncation=True, 
-                max_length=512, 
+                texts,
+                padding=True,
+                truncation=True,
+                max_length=512,
+                pad_to_multiple_of=8,
                 return_tensors='pt'
-            ).to(self.device)
+            )
+            if self.device.startswith("cuda"):
+                # 锁页内存 + 异步拷贝，H2D 传输不阻塞 CPU
+                encoded_input = {
+                    k: v.pin_memory().to(self.device, non_blocking=True)
+                    for k, v in encoded_input.items()
+                }
+            else:
+                encoded_input = encoded_input.to(self.device)
             
-            with torch.no_grad():
+            # inference_mode 比 no_grad 更彻底（不维护版本计数器）；
+            # GPU 上再叠加 fp16 autocast，矩阵乘走 Tensor Core、显存减半
+            use_autocast = self.device.startswith("cuda")
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda", dtype=torch.float16, enabled=use_autocast
+            ):
                 model_output = self.model(**encoded_input)
                 # 使用[CLS] token作为句子表示
                 embeddings = model_output[0][:, 0]
-                
+
+            # 下游统一按 float32 存储/计算，出模型后立刻转回
+            embeddings = embeddings.float()
             if normalize:
                 embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
-                
+
             embeddings = embeddings.cpu().numpy()
-        
-        if is_single_text:
-            if isinstance(embeddings, np.ndarray):
-                return np.squeeze(embeddings, axis=0)
-            if isinstance(embeddings, list) and embeddings and isinstance(embeddings[0], (list, np.ndarray)):
-                return embeddings[0]
-            return embeddings
-        
-        return embeddings
+
+        return np.asarray(embeddings)
+
+    def clear_cache(self) -> None:
+        """清空向量缓存（例如换模型或释放内存时用）。"""
+        self._cache.clear()
     
     def encode_batch(self, texts: List[str], batch_size: int = 32, **kwargs):
         """
         批量编码文本
-        
+
         Args:
             texts: 文本列表
             batch_size: 批大小
-            
+
         Returns:
             向量列表
         """
-        all_embeddings = []
-        
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            embeddings = self.encode(batch, **kwargs)
-            all_embeddings.append(embeddings)
-            
-        return np.vstack(all_embeddings)
+        if not texts:
+            return np.empty((0, self.get_embedding_dim()), dtype=np.float32)
+
+        normalize = kwargs.get("normalize")
+        normalize = normalize if normalize is not None else config.NORMALIZE_EMBEDDINGS
+
+        # 先去重再编码：法律/合同文本里套话和引用重复率高，
+        # 重复片段只前向一次，最后按 inverse 散射回原顺序
+        unique, inverse = np.unique(np.asarray(texts, dtype=object), return_inverse=True)
+        unique_texts = unique.tolist()
+
+        # 批路径同样先查缓存（内存→磁盘），只把真正未命中的交给模型；
+        # 重跑入库脚本时命中率接近 100%，整批编码直接跳过
+        keys = [self._cache_key(t, normalize) for t in unique_texts]
+        resolved: dict = {}
+        miss_idx = []
+        for i, k in enumerate(keys):
+            emb = self._cache.get(k)
+            if emb is None:
+                emb = self._disk_get(k)
+                if emb is not None:
+                    self._cache_insert(k, emb)
+            if emb is not None:
+                resolved[i] = emb
+            else:
+                miss_idx.append(i)
+
+        miss_texts = [unique_texts[i] for i in miss_idx]
+        if miss_texts:
+            if self.use_sentence_transformer:
+                # 直接整批交给 sentence-transformers：它内部自带 mini-batch
+                # 和按长度排序（减少 padding 浪费），外层再切片反而拆掉这些优化
+                miss_emb = self.model.encode(
+                    miss_texts,
+                    batch_size=batch_size,
+                    normalize_embeddings=normalize,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                )
+            else:
+                # transformers 回退路径：先按长度排序再分批，
+                # 每批的 padding 量从“全局最长”降到“批内最长”，最后按原顺序放回
+                order = sorted(range(len(miss_texts)), key=lambda i: len(miss_texts[i]))
+                sorted_texts = [miss_texts[i] for i in order]
+
+                all_embeddings = []
+                for i in range(0, len(sorted_texts), batch_size):
+                    batch = sorted_texts[i:i + batch_size]
+                    all_embeddings.append(self.encode(batch, normalize=normalize))
+                stacked = np.vstack(all_embeddings)
+
+                miss_emb = np.empty_like(stacked)
+                miss_emb[order] = stacked
+
+            for i, emb in zip(miss_idx, np.asarray(miss_emb)):
+                emb = np.asarray(emb)
+                self._cache_insert(keys[i], emb)
+                self._disk_put(keys[i], emb)
+                resolved[i] = emb
+
+        unique_emb = np.stack([resolved[i] for i in range(len(unique_texts))])
+        return unique_emb[inverse]
     
     def get_embedding_dim(self) -> int:
         """获取向量维度"""
@@ -1,18 +1,36 @@
 """
 向量数据库管理器
 """
+import asyncio
 import config
 import numpy as np
 import os
 import shutil
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from api.dbManager.BGEModel import BGEModel
 from api.Segment.contract_split import *
 from typing import List, Union
 
 class VectorDBManager:
     """向量数据库管理器"""
-    
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "VectorDBManager":
+        """
+        进程级单例：ChromaDB 客户端和 BGE 模型都很重（模型加载要数秒），
+        每个请求重新构造会把加载耗时摊到每次查询上。
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
     def __init__(self, persist_directory: str = None):
         """
         初始化向量数据库管理器
@@ -38,21 +56,39 @@ class VectorDBManager:
         # 初始化BGE模型
         self.bge_model = BGEModel()        
         
-        # 获取或创建集合
+        # 获取或创建集合。向量已做 L2 归一化（NORMALIZE_EMBEDDINGS），
+        # 用余弦距离：1 - distance 才是真正的余弦相似度，
+        # SIMILARITY_THRESHOLD 的阈值语义也因此成立（默认的平方欧氏距离无界）
+        hnsw_params = {
+            "hnsw:space": "cosine",
+            "hnsw:M": config.HNSW_M,
+            "hnsw:construction_ef": config.HNSW_EF_CONSTRUCTION,
+            "hnsw:search_ef": config.HNSW_SEARCH_EF,
+        }
+
         self.contract_collection = self.client.get_or_create_collection(
             name=config.COLLECTION_CONTRACTS,
-            metadata={"description": "合同模板集合"}
+            metadata={"description": "合同模板集合", **hnsw_params}
         )
-        
+
         self.law_collection = self.client.get_or_create_collection(
             name=config.COLLECTION_LAWS,
-            metadata={"description": "法律法规集合"}
+            metadata={"description": "法律法规集合", **hnsw_params}
         )
 
         self.case_collection = self.client.get_or_create_collection(
             name=config.COLLECTION_CASE,
-            metadata={"description": "法律案例集合"}
+            metadata={"description": "法律案例集合", **hnsw_params}
         )
+
+        # 三个集合的检索并发执行：HNSW 搜索在原生代码里释放 GIL，
+        # 线程池能拿到真并行
+        self._query_pool = ThreadPoolExecutor(max_workers=3)
+
+        # 语义查询缓存：[(归一化查询向量, 过滤条件, 结果)]，LRU、上限 256 条。
+        # 近似重复的查询（余弦 > 0.97 且过滤条件一致）直接复用整套匹配结果
+        self._query_cache: list = []
+        self._query_cache_max = 256
         
     def add_contract_template(self, content: str, metadata: dict) -> dict:
         """
@@ -70,20 +106,17 @@ class VectorDBManager:
         # 生成模板ID
         template_id = metadata.get("id") or str(uuid.uuid4())
         
-        # 1. 分段处理
+        # 1. 分段处理：整批一次前向，避免逐段调用模型的启动开销
         segments = split_contract(content, data_type="contract")
-        segment_embeddings = []
-        for i in range(len(segments)):
-            print(f"==向量化第{i}段合同文本==")
-            embeddings = self.bge_model.encode(segments[i])
-            segment_embeddings.append(embeddings)
-        segment_embeddings = np.array(segment_embeddings)
+        print(f"==向量化{len(segments)}段合同文本==")
+        segment_embeddings = self.bge_model.encode_batch(segments, batch_size=64)
         
         # 2. 整体合同向量生成（加权平均）
         # 这里可以根据分段的重要性进行加权，简化版本使用简单平均
         if len(segment_embeddings) > 0:
             # 简单平均
-            template_embedding = segment_embeddings.mean(axis=0).tolist()
+            # 直接在 (N, D) 数组上按列求均值，累加用 float32 单趟完成
+            template_embedding = segment_embeddings.mean(axis=0, dtype=np.float32).tolist()
         else:
             # 如果没有分段，直接编码整个文本
             template_embedding = self.bge_model.encode(content).tolist()
@@ -117,21 +150,19 @@ class VectorDBManager:
         
         regulation_id = metadata.get("id") or str(uuid.uuid4())
         
-        #  分段处理
+        #  分段处理：整批编码 + 一次批量写入
         segments = split_contract(content, data_type="law")
-        for i in range(len(segments)):
-            if i % 10 == 0:
-                print(f"==向量化第{i}-{i+10}段法律文本==")
-            segment_embedding = self.bge_model.encode(segments[i])
-            if isinstance(segment_embedding, np.ndarray):
-                segment_embedding = segment_embedding.tolist()
+        if segments:
+            print(f"==向量化{len(segments)}段法律文本==")
+            segment_embeddings = self.bge_model.encode_batch(segments, batch_size=64)
 
             # 存储 TODO 法律法规是否不需要整体存储，只存分段？
+            # 每段带独立 id（原先所有分段共用 regulation_id，后写的覆盖先写的）
             self.law_collection.add(
-                documents=[segments[i]],
-                embeddings=[segment_embedding],
-                metadatas=[metadata],
-                ids=[regulation_id]
+                documents=segments,
+                embeddings=segment_embeddings.tolist(),
+                metadatas=[metadata] * len(segments),
+                ids=[f"{regulation_id}_{i}" for i in range(len(segments))]
             )
 
         return regulation_id
@@ -151,20 +182,17 @@ class VectorDBManager:
         
         regulation_id = metadata.get("id") or str(uuid.uuid4())
         
-        #  分段处理
+        #  分段处理：整批一次前向
         segments = split_contract(content, data_type="case")
-        segment_embeddings = []
-        for i in range(len(segments)):
-            print(f"==向量化第{i}段案例文本==")
-            embeddings = self.bge_model.encode(segments[i])
-            segment_embeddings.append(embeddings)
-        segment_embeddings = np.array(segment_embeddings)
+        print(f"==向量化{len(segments)}段案例文本==")
+        segment_embeddings = self.bge_model.encode_batch(segments, batch_size=64)
 
         # 整体案例向量生成（加权平均）
         # 这里可以根据分段的重要性进行加权，简化版本使用简单平均
         if len(segment_embeddings) > 0:
             # 简单平均
-            template_embedding = segment_embeddings.mean(axis=0).tolist()
+            # 直接在 (N, D) 数组上按列求均值，累加用 float32 单趟完成
+            template_embedding = segment_embeddings.mean(axis=0, dtype=np.float32).tolist()
         else:
             # 如果没有分段，直接编码整个文本
             template_embedding = self.bge_model.encode(content).tolist()
@@ -179,33 +207,164 @@ class VectorDBManager:
         
         return regulation_id
 
-    def search_with_filter(self, query: str, filter_conditions: dict = None, 
-                          collection_name: str = "contracts", n_results: int = 5) -> dict:
+    def embed_many(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        批量编码文本的统一入口
+
+        去重、长度分桶、缓存都在模型层完成；上层只需要把
+        所有待编码文本攒成一个列表交进来。
+
+        Args:
+            texts: 文本列表
+            batch_size: 批大小
+
+        Returns:
+            (N, 向量维度) 的向量数组
+        """
+        return self.bge_model.encode_batch(texts, batch_size=batch_size)
+
+    async def embed_many_async(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        embed_many 的异步版本
+
+        模型前向是阻塞调用，直接在 async 端点里调会卡住事件循环；
+        这里把它挪到线程（PyTorch 在前向时释放 GIL），循环保持响应。
+        """
+        return await asyncio.to_thread(self.embed_many, texts, batch_size)
+
+    def add_law_regulation_batch(self, contents: List[str], metadatas: List[dict]) -> List[str]:
+        """
+        批量添加法律法规
+
+        所有文档的分段合成一个大批次：一次编码、一次写库，
+        免去逐条调用时的 N 次模型前向和 N 次 Chroma 事务。
+
+        Args:
+            contents: 法律条文内容列表
+            metadatas: 与 contents 对齐的元数据列表
+
+        Returns:
+            法规ID列表
+        """
+        import uuid
+
+        all_segments: List[str] = []
+        all_metadatas: List[dict] = []
+        all_ids: List[str] = []
+        regulation_ids: List[str] = []
+
+        for content, metadata in zip(contents, metadatas):
+            regulation_id = metadata.get("id") or str(uuid.uuid4())
+            regulation_ids.append(regulation_id)
+            segments = split_contract(content, data_type="law")
+            all_segments.extend(segments)
+            all_metadatas.extend([metadata] * len(segments))
+            all_ids.extend(f"{regulation_id}_{i}" for i in range(len(segments)))
+
+        if all_segments:
+            print(f"==向量化{len(all_segments)}段法律文本（共{len(contents)}篇）==")
+            embeddings = self.embed_many(all_segments)
+            self.law_collection.add(
+                documents=all_segments,
+                embeddings=embeddings.tolist(),
+                metadatas=all_metadatas,
+                ids=all_ids
+            )
+
+        return regulation_ids
+
+    def add_case_template_batch(self, contents: List[str], metadatas: List[dict]) -> List[str]:
+        """
+        批量添加法律案例
+
+        所有案例的分段扁平化后一次编码，再按篇切回去求均值，
+        最后一次 add 写入全部案例。
+
+        Args:
+            contents: 法律案例内容列表
+            metadatas: 与 contents 对齐的元数据列表
+
+        Returns:
+            案例ID列表
+        """
+        import uuid
+
+        if not contents:
+            return []
+
+        case_ids = [m.get("id") or str(uuid.uuid4()) for m in metadatas]
+        seg_lists = [split_contract(c, data_type="case") for c in contents]
+        flat_segments = [seg for segs in seg_lists for seg in segs]
+
+        if flat_segments:
+            print(f"==向量化{len(flat_segments)}段案例文本（共{len(contents)}篇）==")
+            flat_embeddings = self.embed_many(flat_segments)
+        else:
+            flat_embeddings = np.empty((0, self.bge_model.get_embedding_dim()),
+                                       dtype=np.float32)
+
+        doc_embeddings = []
+        offset = 0
+        for content, segs in zip(contents, seg_lists):
+            if segs:
+                emb = flat_embeddings[offset:offset + len(segs)].mean(
+                    axis=0, dtype=np.float32
+                )
+                offset += len(segs)
+            else:
+                # 没切出分段的，直接编码整篇
+                emb = self.bge_model.encode(content)
+            doc_embeddings.append(np.asarray(emb).tolist())
+
+        self.case_collection.add(
+            documents=list(contents),
+            embeddings=doc_embeddings,
+            metadatas=list(metadatas),
+            ids=case_ids
+        )
+
+        return case_ids
+
+    def search_with_filter(self, query: str, filter_conditions: dict = None,
+                          collection_name: str = "contracts", n_results: int = 5,
+                          include_embeddings: bool = False) -> dict:
         """
         带条件过滤的向量搜索
-        
+
         Args:
             query: 查询文本
             filter_conditions: 过滤条件
             collection_name: 集合名称（contracts/laws/case)
             n_results: 返回结果数量
-            
+            include_embeddings: 是否在结果里带回命中向量（默认不带）
+
         Returns:
             搜索结果
         """
-        # 获取指定集合
+        collection = self._resolve_collection(collection_name)
+
+        # 向量化查询文本
+        query_embedding = self.bge_model.encode(query).tolist()
+
+        return self._query_collection(
+            collection, query_embedding, filter_conditions, n_results,
+            include_embeddings=include_embeddings
+        )
+
+    def _resolve_collection(self, collection_name: str):
+        """按名称取集合（contracts/laws/case）。"""
         if collection_name == "contracts":
-            collection = self.contract_collection
+            return self.contract_collection
         elif collection_name == "laws":
-            collection = self.law_collection
+            return self.law_collection
         elif collection_name == "case":
-            collection = self.case_collection
-        else:
-            raise ValueError(f"未知的集合名称: {collection_name}")
-            
-        # 向量化查询文本
-        query_embedding = self.bge_model.encode(query).tolist()
-        
+            return self.case_collection
+        raise ValueError(f"未知的集合名称: {collection_name}")
+
+    def _query_collection(self, collection, query_embedding: list,
+                          filter_conditions: dict = None, n_results: int = 5,
+                          include_embeddings: bool = False) -> dict:
+        """用预先算好的查询向量查询集合，多个集合共用同一次编码。"""
         # 构建where条件
         where_conditions = None
         if filter_conditions:
@@ -226,15 +385,20 @@ class VectorDBManager:
                     if len(filter_clauses) == 1
                     else {"$and": filter_clauses}
                 )
-                    
-        # 执行查询
+
+        # 执行查询。默认不取命中向量：下游没人用，
+        # 取回来只是白付磁盘读和序列化（5 条 1024 维就是 20KB）
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
+
         results = collection.query(
             query_embeddings=[query_embedding],
             n_results=min(n_results, 100),
             where=where_conditions,
-            include=["documents", "metadatas", "distances", "embeddings"]
+            include=include
         )
-        
+
         return results
     
     def dual_matching(self, user_query: str, user_filters: dict = None) -> dict:
@@ -248,78 +412,89 @@ class VectorDBManager:
         Returns:
             匹配结果
         """
+        # 0. 语义缓存：把查询向量和历史查询做一次批量余弦（矩阵乘一把算完）
+        q_emb = np.asarray(self.bge_model.encode(user_query), dtype=np.float32)
+        q_unit = q_emb / (np.linalg.norm(q_emb) + 1e-12)
+        if self._query_cache:
+            cache_matrix = np.stack([entry[0] for entry in self._query_cache])
+            sims = cache_matrix @ q_unit
+            best = int(np.argmax(sims))
+            if sims[best] > 0.97 and self._query_cache[best][1] == user_filters:
+                # 命中条目移到队尾（LRU 语义）
+                self._query_cache.append(self._query_cache.pop(best))
+                return self._query_cache[-1][2]
+
+        # 三个集合共用同一条查询向量，只编码一次；三路检索并发跑
+        query_embedding = q_emb.tolist()
+
         # 1. 合同模板匹配
-        contract_results = self.search_with_filter(
-            query=user_query,
-            filter_conditions=user_filters,
-            collection_name="contracts",
-            n_results=config.MAX_CONTRACT_RESULTS
+        contract_future = self._query_pool.submit(
+            self._query_collection, self.contract_collection, query_embedding,
+            user_filters, config.MAX_CONTRACT_RESULTS
         )
-        
+
         # 2. 法律法规匹配
-        law_results = self.search_with_filter(
-            query=user_query,
-            filter_conditions=user_filters,
-            collection_name="laws",
-            n_results=config.MAX_LAW_RESULTS
+        law_future = self._query_pool.submit(
+            self._query_collection, self.law_collection, query_embedding,
+            user_filters, config.MAX_LAW_RESULTS
         )
-        
+
         # 3. 法律案例匹配 分段匹配（用于细粒度检索）
-        case_results = self.search_with_filter(
-            query=user_query,
-            filter_conditions=user_filters,
-            collection_name="case",
-            n_results=config.MAX_CASE_RESULTS
+        case_future = self._query_pool.submit(
+            self._query_collection, self.case_collection, query_embedding,
+            user_filters, config.MAX_CASE_RESULTS
         )
-        
-        # 处理结果
-        processed_contracts = []
-        for i in range(len(contract_results['ids'][0])):
-            contract = {
+
+        contract_results = contract_future.result()
+        law_results = law_future.result()
+        case_results = case_future.result()
+        
+        # 处理结果：距离一次性转 NumPy，相似度/阈值/排序全部向量化，
+        # 只在最后按排好的下标建一遍字典
+        contract_sims = 1.0 - np.asarray(contract_results['distances'][0])
+        processed_contracts = [
+            {
                 "id": contract_results['ids'][0][i],
                 "content": contract_results['documents'][0][i],
                 "metadata": contract_results['metadatas'][0][i],
-                "similarity": 1 - contract_results['distances'][0][i],
-                "embedding": contract_results['embeddings'][0][i] if contract_results['embeddings'] else None
+                "similarity": float(contract_sims[i])
             }
-            processed_contracts.append(contract)           
-        # 按相似度排序
-        processed_contracts.sort(key=lambda x: x["similarity"], reverse=True)
-        
-        # 处理法律法规
-        processed_laws = []
-        for i in range(len(law_results['ids'][0])):
-            law = {
+            # 按相似度降序
+            for i in np.argsort(-contract_sims)
+        ]
+
+        # 处理法律法规：过滤低于阈值的，再降序
+        law_sims = 1.0 - np.asarray(law_results['distances'][0])
+        law_keep = np.flatnonzero(law_sims >= config.SIMILARITY_THRESHOLD)
+        processed_laws = [
+            {
                 "id": law_results['ids'][0][i],
                 "content": law_results['documents'][0][i],
                 "metadata": law_results['metadatas'][0][i],
-                "similarity": 1 - law_results['distances'][0][i]
+                "similarity": float(law_sims[i])
             }
-            processed_laws.append(law)            
-        # 过滤低于阈值的法律法规
-        processed_laws = [law for law in processed_laws if law["similarity"] >= config.SIMILARITY_THRESHOLD]
-        processed_laws.sort(key=lambda x: x["similarity"], reverse=True)
-        
-        # 处理案例
-        processed_case = []
-        for i in range(len(case_results['ids'][0])):
-            case = {
+            for i in law_keep[np.argsort(-law_sims[law_keep])]
+        ]
+
+        # 处理案例：同上
+        case_sims = 1.0 - np.asarray(case_results['distances'][0])
+        case_keep = np.flatnonzero(case_sims >= config.SIMILARITY_THRESHOLD)
+        processed_case = [
+            {
                 "id": case_results['ids'][0][i],
                 "content": case_results['documents'][0][i],
                 "metadata": case_results['metadatas'][0][i],
-                "similarity": 1 - case_results['distances'][0][i],
+                "similarity": float(case_sims[i])
             }
-            processed_case.append(case)
-        # 过滤低于阈值的法律案例
-        processed_case = [case for case in processed_case if case["similarity"] >= config.SIMILARITY_THRESHOLD]
-        processed_case.sort(key=lambda x: x["similarity"], reverse=True)
-        
+            for i in case_keep[np.argsort(-case_sims[case_keep])]
+        ]
+
 
         # 选择最匹配的合同和备用合同
         best_contract = processed_contracts[0] if processed_contracts else None
         alternative_contracts = processed_contracts[1:4] if len(processed_contracts) > 1 else []
         
-        return {
+        result = {
             "best_contract": best_contract,
             "alternative_contracts": alternative_contracts,
             "relevant_laws": processed_laws,
@@ -327,7 +502,38 @@ class VectorDBManager:
             "query": user_query,
             "filters": user_filters
         }
+
+        self._query_cache.append((q_unit, user_filters, result))
+        if len(self._query_cache) > self._query_cache_max:
+            self._query_cache.pop(0)
+        return result
     
+    @staticmethod
+    def _fast_copy(src: str, dst: str):
+        """
+        内核态拷贝：copy_file_range 不经过用户态缓冲区，
+        在 btrfs/XFS 上还能走 reflink（秒级克隆大库）；
+        不支持的平台/跨文件系统时回退到 shutil.copy2。
+        """
+        if not hasattr(os, "copy_file_range"):
+            return shutil.copy2(src, dst)
+        try:
+            size = os.stat(src).st_size
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            # ENOSYS / EXDEV 等：退回通用实现
+            return shutil.copy2(src, dst)
+
     def backup_database(self, backup_name: str = None):
         """
         备份数据库到指定目录
@@ -342,7 +548,8 @@ class VectorDBManager:
         
         # 复制整个数据库目录
         if os.path.exists(self.persist_directory):
-            shutil.copytree(self.persist_directory, backup_path, 
+            shutil.copytree(self.persist_directory, backup_path,
+                          copy_function=self._fast_copy,
                           ignore=shutil.ignore_patterns('backups', '*.tmp'))
             
             # 记录备份信息
@@ -0,0 +1,20 @@
+# 给 auth_user.email 补索引：注册查重和邮箱登录都按 email 过滤，
+# Django 默认不给该列建索引，用户量大时是全表扫描
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        # 非唯一索引：Django 不在数据库层强制 email 唯一，
+        # 历史数据可能存在重复，建唯一索引会直接失败
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS auth_user_email_idx ON auth_user (email);",
+            reverse_sql="DROP INDEX IF EXISTS auth_user_email_idx;",
+        ),
+    ]
@@ -1,5 +1,6 @@
 import json
 import os
+import re
 from pathlib import Path
 from typing import Dict, Generator, Iterable
 
@@ -22,6 +23,13 @@ if PROMPT_PATH.exists():
 else:
     SYSTEM_PROMPT_TEMPLATE = DEFAULT_PROMPT_TEMPLATE
 
+# 四个知识库占位符一次 sub 替换掉，免得 replace 链每次都扫整串模板
+_KNOWLEDGE_PLACEHOLDER_RE = re.compile(
+    "|".join(map(re.escape, (
+        "{最新法律法规}", "{最新合同纠纷案}", "{最新国标行规}", "{最新合同范本}"
+    )))
+)
+
 
 def _get_openai_client() -> OpenAI:
     api_key = os.getenv("VITE_HUOSHAN_API_KEY")
@@ -66,10 +74,15 @@ async def _build_system_prompt_async(payload: Dict) -> str:
             standards_str = " ".join(knowledge.get("standards", [])) or standards_str
             templates_str = " ".join(knowledge.get("templates", [])) or templates_str
 
-    template = template.replace("{最新法律法规}", laws_str)
-    template = template.replace("{最新合同纠纷案}", cases_str)
-    template = template.replace("{最新国标行规}", standards_str)
-    template = template.replace("{最新合同范本}", templates_str)
+    mapping = {
+        "{最新法律法规}": laws_str,
+        "{最新合同纠纷案}": cases_str,
+        "{最新国标行规}": standards_str,
+        "{最新合同范本}": templates_str,
+    }
+    template = _KNOWLEDGE_PLACEHOLDER_RE.sub(
+        lambda m: mapping[m.group(0)], template
+    )
 
     return template.format(
         合同类型=payload.get("contract_type"),
@@ -35,10 +35,15 @@ class SimpleRegisterView(APIView):
                 clean_prefix = "user"
             username = f"{clean_prefix}_{uuid.uuid4().hex[:6]}"
 
-        # 确保用户名唯一
+        # 确保用户名唯一：一次查询取回所有前缀冲突，在内存里挑空位，
+        # 避免 while-exists 每轮一个数据库往返
         base_username = username
+        existing = set(
+            User.objects.filter(username__startswith=base_username)
+            .values_list("username", flat=True)
+        )
         counter = 1
-        while User.objects.filter(username=username).exists():
+        while username in existing:
             username = f"{base_username}{counter}"
             counter += 1
 
@@ -79,10 +84,14 @@ class SimpleRegisterView(APIView):
         email_prefix = email.split('@')[0]
         username = f"{email_prefix}_{uuid.uuid4().hex[:6]}"
 
-        # 确保用户名唯一
+        # 确保用户名唯一：一次查询取回所有前缀冲突，在内存里挑空位
         base_username = username
+        existing = set(
+            User.objects.filter(username__startswith=base_username)
+            .values_list("username", flat=True)
+        )
         counter = 1
-        while User.objects.filter(username=username).exists():
+        while username in existing:
             username = f"{base_username}_{counter}"
             counter += 1
 
@@ -231,7 +240,7 @@ class UserQueryView(APIView):
                 query_fragments.append(fragment)
         combined_query_text = " ".join(query_fragments)
 
-        vector_database_manager = VectorDBManager()
+        vector_database_manager = VectorDBManager.get_instance()
         search_result = vector_database_manager.dual_matching(
             user_query=combined_query_text,
             user_filters=user_filters
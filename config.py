@@ -15,11 +15,25 @@ LAWS_DIR = os.path.join(DATA_DIR, "laws")
 BGE_MODEL_NAME = os.path.join(BASE_DIR, "models", "bge-large-zh")
 EMBEDDING_DIM = 1024
 NORMALIZE_EMBEDDINGS = True
+# 用 torch.compile 编译编码器 forward（首个 batch 有编译耗时，之后每批更快）
+TORCH_COMPILE = False
+# CUDA 下用半精度权重跑编码器（显存减半、矩阵乘走 Tensor Core；CPU 上忽略）
+USE_FP16 = True
+# 向量磁盘缓存目录；置 None 关闭。相同文本+模型跨进程复用，免重复前向
+EMBED_CACHE_DIR = os.path.join(VECTOR_DB_DIR, "embed_cache")
+# CPU 部署可置 "onnx-int8" 走量化 ONNX 后端（需要模型目录下有量化导出文件）
+BGE_QUANTIZATION = None
 
 # 数据库配置
 COLLECTION_CONTRACTS = "contract_templates"
 COLLECTION_LAWS = "legal_regulations"
-COLLECTION_CASE = "case_templates"  
+COLLECTION_CASE = "case_templates"
+
+# HNSW 索引参数：M / ef_construction 在建索引时一次付清、换来长期低查询成本，
+# search_ef 是查询时的召回-延迟旋钮（越大召回越高、越慢）
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_SEARCH_EF = 64
 
 # 检索配置
 SIMILARITY_THRESHOLD = 0.75  # 相似度阈值
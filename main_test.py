@@ -1,50 +1,94 @@
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
 from api.dbManager.VectorDBManager import VectorDBManager
 from api.Segment.contract_split import receive_crawl_data
 from api.crawler.flk_crawler import crawl_laws
 
+
 # ====================== 4. 主函数：串联爬虫+分块+向量库流程 ======================
-if __name__ == "__main__":
+def ingest_laws(db_manager: VectorDBManager, keyword: str, max_pages: int = 1) -> None:
+    """抓取法规数据并批量写入向量库。"""
     # ========== 步骤1：调用爬虫接口，抓取真实法规数据 ==========
     print("📌 开始抓取法规数据...")
-    # 配置爬虫参数：关键词、翻页数等
-    laws_keyword = "合同法"  # 可替换为"公司法""合同法"等
     crawl_results = crawl_laws(
-        laws_keyword, 
-        max_pages=1,       # 抓取2页结果，可调整
+        keyword,
+        max_pages=max_pages,
         auto_txt=True      # 自动生成txt文件，必须开启
     )
     print(f"✅ 爬虫完成，共抓取 {len(crawl_results)} 条法规数据\n")
 
-    # ========== 步骤2：循环处理每条爬虫数据 ==========
-    db_manager = VectorDBManager()
-    for idx, crawl_data in enumerate(crawl_results, start=1):
+    # ========== 步骤2：并行提取数据，攒成批次后一次性入库 ==========
+    # 提取/解析是每条独立的纯函数，用进程池铺满所有核并行跑
+    with ProcessPoolExecutor() as extract_pool:
+        extracted = list(extract_pool.map(
+            receive_crawl_data, crawl_results, chunksize=8
+        ))
+
+    law_contents, law_metadatas = [], []
+    case_contents, case_metadatas = [], []
+    seen_hashes = set()  # 按正文哈希去重，翻页重叠的同一篇法规只入库一次
+    for idx, (crawl_data, (data_id, data_type, raw_text)) in enumerate(
+            zip(crawl_results, extracted), start=1):
         print(f"===== 处理第 {idx} 条数据：{crawl_data.get('title')} =====")
-        
-        # 调用输入接口，提取信息
-        data_id, data_type, raw_text = receive_crawl_data(crawl_data)
+
         if not raw_text:
             print("❌ 该条数据无txt内容，跳过\n")
             continue
+
+        content_hash = hashlib.blake2b(
+            raw_text.encode("utf-8"), digest_size=16
+        ).digest()
+        if content_hash in seen_hashes:
+            print("⏩ 正文与已处理数据重复，跳过\n")
+            continue
+        seen_hashes.add(content_hash)
         print(f"📄 提取文本长度：{len(raw_text)} 字")
 
         if(data_type == "law"):
-            # 法律向量入库
-            law_metadata = {
+            # 法律入库数据
+            law_contents.append(raw_text)
+            law_metadatas.append({
                 "id":crawl_data.get('id'),
                 "title":crawl_data.get('title'),
                 "region":"全国",
                 "gbrq_date":crawl_data.get('gbrq'),
-            }
-            db_manager.add_law_regulation(content = raw_text,metadata = law_metadata)
+            })
         elif(data_type == "case"):
-            # 法律案例入库
-            case_metadata = {
+            # 法律案例入库数据
+            case_contents.append(raw_text)
+            case_metadatas.append({
                 "id":crawl_data.get('id'),
                 "title":crawl_data.get('title'),
                 "gbrq_date":crawl_data.get('gbrq'),
-            }
-            db_manager.add_case_template(content = raw_text,metadata = case_metadata)
+            })
+
+    # 批量入库：整个批次只做一次编码和一次写库
+    if law_contents:
+        db_manager.add_law_regulation_batch(law_contents, law_metadatas)
+    if case_contents:
+        db_manager.add_case_template_batch(case_contents, case_metadatas)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="抓取法规并写入向量库")
+    parser.add_argument("--keyword", default="合同法",
+                        help='搜索关键词，可换"公司法""民法典"等')
+    parser.add_argument("--max-pages", type=int, default=1, help="抓取页数")
+    parser.add_argument("--no-backup", action="store_true",
+                        help="入库后不做数据库备份")
+    args = parser.parse_args()
+
+    # 管理器只建一次（模型加载很重），各入库阶段共用
+    db_manager = VectorDBManager.get_instance()
+    ingest_laws(db_manager, args.keyword, max_pages=args.max_pages)
 
     # ========== 步骤3：向量数据库本地保存 ==========
-    db_manager.backup_database()
-    print("🎉 全部数据处理完成，向量库已更新！")
\ No newline at end of file
+    if not args.no_backup:
+        db_manager.backup_database()
+    print("🎉 全部数据处理完成，向量库已更新！")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,48 +1,79 @@
-#import httpx 
+from functools import lru_cache
 
-async def retrieve_knowledge_from_kb(query: str, contract_type: str = None, cooperation_purpose: str = None, Core_scenario: str = None, top_k: int = 3) -> dict:
+# 模拟知识库内容作为模块常量，免得每次调用重建一遍字典
+_SALES_KB = {
+    "latest_laws": [
+        "《中华人民共和国民法典》第465条：依法成立的合同，受法律保护。",
+        "《中华人民共和国民法典》第595条：买卖合同是出卖人转移标的物的所有权于买受人，买受人支付价款的合同。",
+        "《中华人民共和国民法典》第604条：标的物毁损、灭失的风险，在标的物交付之前由出卖人承担，交付之后由买受人承担。"
+    ],
+    "case_studies": [
+        "最高人民法院公报案例：某公司与某供应商买卖合同纠纷案，判决强调交货凭证的重要性。",
+        "典型案例：某货物质量争议案，判定应以国家标准作为判定依据，除非另有明确约定。"
+    ],
+    "standards": [
+        "GBT 19001-2016 质量管理体系 要求 (ISO 9001:2015, IDT)",
+        "行业标准：XX货物采购验收规范"
+    ],
+    "templates": [
+        "通用货物买卖合同范本（2023版）"
+    ]
+}
+
+_LEASE_KB = {
+    "latest_laws": [
+        "《中华人民共和国民法典》第703条：租赁合同是出租人将租赁物交付承租人使用、收益，承租人支付租金的合同。",
+        "《中华人民共和国民法典》第704条：租赁合同的内容一般包括租赁物的名称、数量、用途、租赁期限、租金及其支付期限和方式、租赁物维修等条款。",
+    ],
+    "case_studies": [],
+    "standards": [],
+    "templates": []
+}
+
+_EMPTY_KB = {
+    "latest_laws": [],
+    "case_studies": [],
+    "standards": [],
+    "templates": []
+}
+
+
+# 关键词 → 知识库 的路由表；新增合同品类只需在这里加词条，
+# 不用再往 if/elif 阶梯里塞分支
+_KEYWORD_KB = {
+    "买卖合同": _SALES_KB,
+    "采购合同": _SALES_KB,
+    "租赁合同": _LEASE_KB,
+}
+
+
+@lru_cache(maxsize=4096)
+def _classify(query: str, contract_type: str) -> dict:
+    """
+    按关键词把查询归类到对应知识库。
+
+    查询和合同类型拼成一个串只扫一遍，按路由表顺序取第一个命中。
+    热门查询（"买卖合同"、"租赁合同" 等会反复出现）直接命中
+    lru_cache，省掉每次请求的子串扫描。contract_type 统一转成
+    字符串后再匹配，None 也不会炸。
+    """
+    haystack = query + " " + contract_type
+    for keyword, kb in _KEYWORD_KB.items():
+        if keyword in haystack:
+            return kb
+    return _EMPTY_KB
+
+
+async def retrieve_knowledge_from_kb(query: str, contract_type: str = None, cooperation_purpose: str = None, Core_scenario: str = None, top_k: int = 3, client=None) -> dict:
     """
     负责从外部知识库服务检索相关信息。
+
+    client 是应用生命周期内复用的 httpx.AsyncClient（由 FastAPI 的
+    lifespan 创建），真正接入知识库服务时用它发请求，连接可复用。
     """
     #print(f"Retrieving knowledge for query: '{query}' (Contract Type: {contract_type}, Purpose: {cooperation_purpose}, Core Scenario: {Core_scenario})")
     # TODO: 在这里添加实际调用外部知识库服务的逻辑
-    # 例如，构建 HTTP 请求，发送到向量数据库的API，处理响应等
-    
-    # 目前仍然使用模拟数据
-    if "买卖合同" in query or "采购合同" in str(contract_type):
-        return {
-            "latest_laws": [
-                "《中华人民共和国民法典》第465条：依法成立的合同，受法律保护。",
-                "《中华人民共和国民法典》第595条：买卖合同是出卖人转移标的物的所有权于买受人，买受人支付价款的合同。",
-                "《中华人民共和国民法典》第604条：标的物毁损、灭失的风险，在标的物交付之前由出卖人承担，交付之后由买受人承担。"
-            ],
-            "case_studies": [
-                "最高人民法院公报案例：某公司与某供应商买卖合同纠纷案，判决强调交货凭证的重要性。",
-                "典型案例：某货物质量争议案，判定应以国家标准作为判定依据，除非另有明确约定。"
-            ],
-            "standards": [
-                "GBT 19001-2016 质量管理体系 要求 (ISO 9001:2015, IDT)",
-                "行业标准：XX货物采购验收规范"
-            ],
-            "templates": [
-                "通用货物买卖合同范本（2023版）"
-            ]
-        }
-    elif "租赁合同" in query or "租赁合同" in contract_type:
-        return {
-            "latest_laws": [
-                "《中华人民共和国民法典》第703条：租赁合同是出租人将租赁物交付承租人使用、收益，承租人支付租金的合同。",
-                "《中华人民共和国民法典》第704条：租赁合同的内容一般包括租赁物的名称、数量、用途、租赁期限、租金及其支付期限和方式、租赁物维修等条款。",
-            ],
-            "case_studies": [],
-            "standards": [],
-            "templates": []
-        }
-    else:
-        return {
-            "latest_laws": [],
-            "case_studies": [],
-            "standards": [],
-            "templates": []
-        }
+    # 例如 await client.post(kb_url, json=payload)，处理响应等
 
+    # 目前仍然使用模拟数据
+    return _classify(query, str(contract_type or ""))
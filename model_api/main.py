@@ -1,16 +1,45 @@
 from fastapi import FastAPI
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware  # CORS支持
+from contextlib import asynccontextmanager
 import os
+import re
+import httpx
 import openai
 from dotenv import load_dotenv #用于加载env文件
 from pathlib import Path # 使用 pathlib 处理路径
 from pydantic import BaseModel # 用于更规范的请求体定义
 import json
+from functools import lru_cache
 from .knowledge_retriever import retrieve_knowledge_from_kb
 
+try:
+    import orjson  # C 实现的 JSON，直接产出 bytes；未安装时退回标准库
+except ImportError:
+    orjson = None
+
+
+def _sse(payload: dict) -> bytes:
+    """编码一帧 SSE 数据。orjson 省掉中文转义和 UTF-8 重编码两步。"""
+    if orjson is not None:
+        data = orjson.dumps(payload)
+    else:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return b"data: " + data + b"\n\n"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 应用级 HTTP 客户端：连接池 + keep-alive，
+    # 知识库检索复用连接，免去每次调用的 DNS/TCP/TLS 建连
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=64)
+    )
+    yield
+    await app.state.http.aclose()
+
+
 #用来暴露给后端的接口
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # 添加CORS中间件（允许前端跨域访问）
 app.add_middleware(
@@ -24,7 +53,8 @@ app.add_middleware(
 #配置豆包AI客户端
 load_dotenv()
 api_key = os.getenv("VITE_HUOSHAN_API_KEY")
-client = openai.OpenAI(
+# 异步客户端：流式等待期间让出事件循环，多个生成请求才能真正并发
+client = openai.AsyncOpenAI(
     base_url="https://ark.cn-beijing.volces.com/api/v3",
     api_key=api_key,
 )
@@ -56,7 +86,58 @@ except Exception as e:
     print(f"Error reading system prompt file: {e}")
     system_prompt_content = "你是一个合同生成助手。请按正式合同格式、条款编号清晰地输出完整合同文本。" # Fallback
 
-async def prompt_insert(request: GenerateRequest,template = system_prompt_content) -> str:
+# 模板里所有可替换的占位符；启动时按它们把模板切成片段，
+# 渲染就只剩一次 join，不用四次 replace + 一次 format 反复扫整串
+_PLACEHOLDER_RE = re.compile(
+    r"\{(最新法律法规|最新合同纠纷案|最新国标行规|最新合同范本|"
+    r"合同类型|甲方|乙方|合作目的|合同核心场景)\}"
+)
+
+
+def _compile_template(template: str) -> list:
+    """把模板预切成 [文本片段 | (占位符名,)] 列表，单元组标记占位符。"""
+    parts = []
+    pos = 0
+    for m in _PLACEHOLDER_RE.finditer(template):
+        if m.start() > pos:
+            parts.append(template[pos:m.start()])
+        parts.append((m.group(1),))
+        pos = m.end()
+    if pos < len(template):
+        parts.append(template[pos:])
+    return parts
+
+
+_compiled_prompt = _compile_template(system_prompt_content)
+
+
+def _render_prompt(values: dict) -> str:
+    """单趟填充预编译模板。"""
+    return "".join(
+        values[p[0]] if isinstance(p, tuple) else p for p in _compiled_prompt
+    )
+
+
+@lru_cache(maxsize=256)
+def _render_prompt_cached(laws_str: str, cases_str: str, standards_str: str,
+                          templates_str: str, contract_type: str,
+                          first_party: str, second_party: str,
+                          purpose: str, scenario: str) -> str:
+    """按完整变量组合缓存渲染结果：同类型合同反复生成时直接复用整串。"""
+    return _render_prompt({
+        "最新法律法规": laws_str,
+        "最新合同纠纷案": cases_str,
+        "最新国标行规": standards_str,
+        "最新合同范本": templates_str,
+        "合同类型": contract_type,
+        "甲方": first_party,
+        "乙方": second_party,
+        "合作目的": purpose,
+        "合同核心场景": scenario
+    })
+
+
+async def prompt_insert(request: GenerateRequest) -> str:
 
     # 默认值，如果未检索到信息或不使用知识库
     default_laws = "暂无检索到最新法律法规"
@@ -69,35 +150,35 @@ async def prompt_insert(request: GenerateRequest,template = system_prompt_conten
     standards_str = default_standards
     templates_str = default_templates
 
-    retrieve_knowledge = await retrieve_knowledge_from_kb(request.prompt, request.contract_type, request.cooperation_purpose,request.Core_scenario) if request.use_new_knowledge_base else None
-    if retrieve_knowledge:
-        # 将列表转换为字符串，每个条目一行，如果列表为空则使用默认值
-        laws_str = " ".join(retrieve_knowledge.get("latest_laws", [])) or default_laws
-        cases_str = " ".join(retrieve_knowledge.get("case_studies", [])) or default_cases 
-        standards_str = " ".join(retrieve_knowledge.get("standards", [])) or default_standards
-        templates_str = " ".join(retrieve_knowledge.get("templates", [])) or default_templates
-
-    # 没有检索信息设为空或默认值
-    template = template.replace("{最新法律法规}", laws_str)
-    template = template.replace("{最新合同纠纷案}", cases_str)
-    template = template.replace("{最新国标行规}", standards_str)
-    template = template.replace("{最新合同范本}", templates_str)
-
-    system_prompt_content = template.format(
-        合同类型=request.contract_type,
-        甲方=request.first_party,
-        乙方=request.second_party,
-        合作目的 = request.cooperation_purpose if request.cooperation_purpose is not None else "",
-        合同核心场景 = request.Core_scenario if request.Core_scenario is not None else ""      
+    # 不用知识库时完全跳过检索协程和各列表的拼接
+    if request.use_new_knowledge_base:
+        retrieve_knowledge = await retrieve_knowledge_from_kb(request.prompt, request.contract_type, request.cooperation_purpose,request.Core_scenario, client=getattr(app.state, "http", None))
+
+        def pick(key: str, default: str) -> str:
+            # 每个键只查一次字典；非空才 join，按"每个条目一行"用换行拼接
+            values = retrieve_knowledge.get(key)
+            return "\n".join(values) if values else default
+
+        laws_str = pick("latest_laws", default_laws)
+        cases_str = pick("case_studies", default_cases)
+        standards_str = pick("standards", default_standards)
+        templates_str = pick("templates", default_templates)
+
+    return _render_prompt_cached(
+        laws_str, cases_str, standards_str, templates_str,
+        request.contract_type,
+        request.first_party,
+        request.second_party,
+        request.cooperation_purpose if request.cooperation_purpose is not None else "",
+        request.Core_scenario if request.Core_scenario is not None else ""
     )
-    return system_prompt_content
 
 
 @app.post("/generate-contract")
 async def generate_contract(request: GenerateRequest):
     system_prompt_content = await prompt_insert(request)
     async def generate_chunks():
-        full_content = ""  # 用于累积完整内容
+        total_len = 0  # 只需要总长度，不必把全文再拼一遍
         try:
             messages=[
                 {"role": "system", "content": system_prompt_content},
@@ -106,7 +187,7 @@ async def generate_contract(request: GenerateRequest):
             print(messages)
 
             # 开启流式输出
-            stream_response = client.chat.completions.create(
+            stream_response = await client.chat.completions.create(
                 model = model_name,
                 messages=messages,
                 max_tokens=request.max_new_tokens,
@@ -114,20 +195,20 @@ async def generate_contract(request: GenerateRequest):
                 stream=True,
             )
 
-            for chunk in stream_response:
+            async for chunk in stream_response:
                 if chunk.choices and chunk.choices[0].delta.content is not None:
                     content = chunk.choices[0].delta.content
-                    full_content += content
-                    # 返回每个生成的文本块（SSE格式）
-                    yield f"data: {json.dumps({'content': content}, ensure_ascii=False)}\n\n"
-            
+                    total_len += len(content)
+                    # 返回每个生成的文本块（SSE格式，直接产 bytes）
+                    yield _sse({'content': content})
+
             # 发送结束标记
-            yield f"data: {json.dumps({'done': True, 'total_length': len(full_content)}, ensure_ascii=False)}\n\n"
-            
+            yield _sse({'done': True, 'total_length': total_len})
+
         except Exception as e:
             error_msg = f"Error during streaming generation: {str(e)}"
             print(error_msg)
-            yield f"data: {json.dumps({'error': error_msg}, ensure_ascii=False)}\n\n"
+            yield _sse({'error': error_msg})
 
     return StreamingResponse(
         generate_chunks(),